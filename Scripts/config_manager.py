@@ -4,14 +4,26 @@ Handles loading and validation of configuration files.
 """
 
 import configparser
-import pandas as pd
+import csv
+import errno
+import io
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Tuple, Optional
 from dataclasses import dataclass
-from utils import BIMailerLogger, validate_email, split_email_list
+from utils import get_logger, validate_email, split_email_list
 
 
-@dataclass
+# Config objects are immutable once parsed; slots (Python 3.10+) drop the per-instance __dict__
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
 class EmailConfig:
     """Email configuration settings."""
     use_default_mailer: bool
@@ -21,17 +33,25 @@ class EmailConfig:
     smtp_password: str
     use_tls: bool
     use_ssl: bool
+    concurrency: int = 1
+    async_send: bool = False
+    reveal_attachment: bool = False
 
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
 class GeneralConfig:
     """General configuration settings."""
     log_retention_days: int
     max_attachment_size_mb: int
     processing_lock_timeout_minutes: int
+    cleanup_delete_qps: int = 0
+    folder_workers: int = 1
+    pipeline_folders: bool = False
+    outage_abort_min_folders: int = 30
+    outage_abort_percent: int = 33
 
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
 class AdminConfig:
     """Admin configuration settings."""
     admin_emails: List[str]
@@ -39,17 +59,19 @@ class AdminConfig:
     send_error_notifications: bool
 
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
 class ProcessingConfig:
     """Processing configuration settings."""
-    png_file_extensions: List[str]
+    png_file_extensions: FrozenSet[str]
     archive_after_processing: bool
     override_existing_lock: bool
     date_format: str
     timestamp_format: str
+    pdf_max_image_dpi: int = 0
+    pdf_jpeg_quality: int = 0
 
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
 class MailingEntry:
     """Single mailing list entry."""
     pdf_name: str
@@ -58,40 +80,182 @@ class MailingEntry:
     subject: str
 
 
+# Matches each ".ext" entry in the png_file_extensions setting
+_EXT_RE = re.compile(r'\.[A-Za-z0-9]+')
+
+
+# Process-level caches of parsed configuration files, keyed by
+# (path, mtime, size) so edited files are re-parsed automatically.
+CacheKey = Tuple[str, float, int]
+
+_CACHE_LOCK = threading.Lock()
+_CONFIG_CACHE: Dict[CacheKey, Tuple[EmailConfig, GeneralConfig, AdminConfig, ProcessingConfig]] = {}
+_PDF_NAMES_CACHE: Dict[CacheKey, Dict[str, str]] = {}
+_MAILING_LIST_CACHE: Dict[CacheKey, List[MailingEntry]] = {}
+
+
+def _cache_key(path: Path, description: str) -> CacheKey:
+    """Stat a configuration file once and build a key that changes whenever it is modified."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(errno.ENOENT, f"{description} not found", str(path)) from None
+    return (str(path), st.st_mtime, st.st_size)
+
+
+def _get_cached(cache: Dict, key: CacheKey):
+    """Return a cached value or None."""
+    with _CACHE_LOCK:
+        return cache.get(key)
+
+
+def _store_cached(cache: Dict, key: CacheKey, value):
+    """Store a parsed value, dropping stale entries for the same file."""
+    with _CACHE_LOCK:
+        for stale_key in [k for k in cache if k[0] == key[0]]:
+            del cache[stale_key]
+        cache[key] = value
+
+
+def _evict_cached(*paths: Path):
+    """Remove all cached entries for the given files."""
+    names = {str(path) for path in paths}
+    with _CACHE_LOCK:
+        for cache in (_CONFIG_CACHE, _PDF_NAMES_CACHE, _MAILING_LIST_CACHE):
+            for stale_key in [k for k in cache if k[0] in names]:
+                del cache[stale_key]
+
+
+def _read_csv(path: Path, required_columns: List[str], description: str) -> List[Dict[str, str]]:
+    """Read a configuration CSV, validating the header before any data rows are parsed."""
+    # Config CSVs are tiny: read them in one call and parse from memory.
+    # Decoding the bytes ourselves keeps line endings intact, as newline='' would.
+    f = io.StringIO(path.read_bytes().decode('utf-8-sig'), newline='')
+    header = next(csv.reader(f), [])
+    missing_columns = [col for col in required_columns if col not in header]
+    if missing_columns:
+        raise ValueError(f"Missing required columns in {description}: {missing_columns}")
+    
+    return list(csv.DictReader(f, fieldnames=header))
+
+
+def _parse_bool(value: Optional[str], fallback: Optional[bool] = None) -> Optional[bool]:
+    """Convert an INI value to bool using configparser's accepted spellings."""
+    if value is None:
+        return fallback
+    try:
+        return configparser.ConfigParser.BOOLEAN_STATES[value.strip().lower()]
+    except KeyError:
+        raise ValueError(f"Not a boolean: {value}")
+
+
+def _parse_int(value: Optional[str], fallback: Optional[int] = None) -> Optional[int]:
+    """Convert an INI value to int."""
+    if value is None:
+        return fallback
+    return int(value)
+
+
 class ConfigManager:
     """Manages all configuration files and settings."""
     
     def __init__(self, config_dir: str = "Config"):
         # Handle relative paths when running from Scripts directory
-        if not Path(config_dir).exists() and Path("..") / config_dir:
-            config_dir = str(Path("..") / config_dir)
+        if not os.path.exists(config_dir):
+            config_dir = os.path.join("..", config_dir)
         
         self.config_dir = Path(config_dir)
-        self.logger = BIMailerLogger()
+        self.logger = get_logger()
         
         # Configuration file paths
         self.settings_file = self.config_dir / "settings.ini"
         self.pdf_names_file = self.config_dir / "pdf_names.csv"
         self.mailing_list_file = self.config_dir / "mailing_list.csv"
         
-        # Configuration objects
-        self.email_config: Optional[EmailConfig] = None
-        self.general_config: Optional[GeneralConfig] = None
-        self.admin_config: Optional[AdminConfig] = None
-        self.processing_config: Optional[ProcessingConfig] = None
+        # Configuration objects (loaded lazily on first access)
+        self._email_config: Optional[EmailConfig] = None
+        self._general_config: Optional[GeneralConfig] = None
+        self._admin_config: Optional[AdminConfig] = None
+        self._processing_config: Optional[ProcessingConfig] = None
         
-        # Configuration data
-        self.pdf_names_mapping: Dict[str, str] = {}
-        self.mailing_list: List[MailingEntry] = []
+        # Configuration data (loaded lazily on first access)
+        self._pdf_names_mapping: Optional[Dict[str, str]] = None
+        self._all_pdf_names_cache: Optional[List[str]] = None
+        self._mailing_list: Optional[List[MailingEntry]] = None
+        self._mailing_by_pdf: Dict[str, List[MailingEntry]] = {}
         
-        self._load_all_configs()
+        self._summary_cache: Optional[Mapping] = None
+        
+        # Cache keys (path, mtime, size) of the files backing the loaded data
+        self._loaded_keys: Dict[Path, CacheKey] = {}
     
-    def _load_all_configs(self):
-        """Load all configuration files."""
-        try:
+    @property
+    def email_config(self) -> EmailConfig:
+        """Email settings, parsed from settings.ini on first access."""
+        if self._email_config is None:
+            self._load_settings()
+        return self._email_config
+    
+    @property
+    def general_config(self) -> GeneralConfig:
+        """General settings, parsed from settings.ini on first access."""
+        if self._general_config is None:
+            self._load_settings()
+        return self._general_config
+    
+    @property
+    def admin_config(self) -> AdminConfig:
+        """Admin settings, parsed from settings.ini on first access."""
+        if self._admin_config is None:
+            self._load_settings()
+        return self._admin_config
+    
+    @property
+    def processing_config(self) -> ProcessingConfig:
+        """Processing settings, parsed from settings.ini on first access."""
+        if self._processing_config is None:
             self._load_settings()
+        return self._processing_config
+    
+    @property
+    def pdf_names_mapping(self) -> Dict[str, str]:
+        """FolderName -> PDFName mapping, parsed on first access."""
+        if self._pdf_names_mapping is None:
             self._load_pdf_names()
+        return self._pdf_names_mapping
+    
+    @property
+    def mailing_list(self) -> List[MailingEntry]:
+        """Mailing list entries, parsed on first access."""
+        if self._mailing_list is None:
             self._load_mailing_list()
+        return self._mailing_list
+    
+    def _load_all_configs(self):
+        """Load any configuration files that have not been loaded yet.
+        
+        The files are independent and each loader writes disjoint attributes,
+        so they are read concurrently to overlap file I/O.
+        """
+        loaders = []
+        if self._email_config is None:
+            loaders.append(self._load_settings)
+        if self._pdf_names_mapping is None:
+            loaders.append(self._load_pdf_names)
+        if self._mailing_list is None:
+            loaders.append(self._load_mailing_list)
+        
+        self._summary_cache = None
+        
+        try:
+            if len(loaders) > 1:
+                with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+                    futures = [executor.submit(loader) for loader in loaders]
+                    for future in futures:
+                        future.result()
+            else:
+                for loader in loaders:
+                    loader()
             self.logger.log_file_operation("All configuration files loaded successfully")
         except Exception as e:
             self.logger.log_error("Failed to load configuration files", e)
@@ -99,74 +263,101 @@ class ConfigManager:
     
     def _load_settings(self):
         """Load settings from INI file."""
-        if not self.settings_file.exists():
-            raise FileNotFoundError(f"Settings file not found: {self.settings_file}")
+        cache_key = _cache_key(self.settings_file, "Settings file")
+        self._loaded_keys[self.settings_file] = cache_key
+        cached = _get_cached(_CONFIG_CACHE, cache_key)
+        if cached is not None:
+            self._email_config, self._general_config, self._admin_config, self._processing_config = cached
+            self.logger.log_file_operation("Settings configuration loaded from cache")
+            return
         
+        # read() silently ignores a missing file; read_file() on an open handle raises instead
         config = configparser.ConfigParser()
-        config.read(self.settings_file)
+        with open(self.settings_file, 'r', encoding='utf-8') as f:
+            config.read_file(f)
         
         # Load email configuration
-        email_section = config['Email']
-        self.email_config = EmailConfig(
-            use_default_mailer=email_section.getboolean('use_default_mailer'),
+        email_section = dict(config['Email'])
+        email_config = EmailConfig(
+            use_default_mailer=_parse_bool(email_section.get('use_default_mailer')),
             smtp_server=email_section.get('smtp_server'),
-            smtp_port=email_section.getint('smtp_port'),
+            smtp_port=_parse_int(email_section.get('smtp_port')),
             smtp_username=email_section.get('smtp_username'),
             smtp_password=email_section.get('smtp_password'),
-            use_tls=email_section.getboolean('use_tls'),
-            use_ssl=email_section.getboolean('use_ssl', fallback=False)
+            use_tls=_parse_bool(email_section.get('use_tls')),
+            use_ssl=_parse_bool(email_section.get('use_ssl'), fallback=False),
+            concurrency=_parse_int(email_section.get('concurrency'), fallback=1),
+            async_send=_parse_bool(email_section.get('async_send'), fallback=False),
+            reveal_attachment=_parse_bool(email_section.get('reveal_attachment'), fallback=False)
         )
         
         # Load general configuration
-        general_section = config['General']
-        self.general_config = GeneralConfig(
-            log_retention_days=general_section.getint('log_retention_days'),
-            max_attachment_size_mb=general_section.getint('max_attachment_size_mb'),
-            processing_lock_timeout_minutes=general_section.getint('processing_lock_timeout_minutes')
+        general_section = dict(config['General'])
+        general_config = GeneralConfig(
+            log_retention_days=_parse_int(general_section.get('log_retention_days')),
+            max_attachment_size_mb=_parse_int(general_section.get('max_attachment_size_mb')),
+            processing_lock_timeout_minutes=_parse_int(general_section.get('processing_lock_timeout_minutes')),
+            cleanup_delete_qps=_parse_int(general_section.get('cleanup_delete_qps'), fallback=0),
+            folder_workers=_parse_int(general_section.get('folder_workers'), fallback=1),
+            pipeline_folders=_parse_bool(general_section.get('pipeline_folders'), fallback=False),
+            outage_abort_min_folders=_parse_int(general_section.get('outage_abort_min_folders'), fallback=30),
+            outage_abort_percent=_parse_int(general_section.get('outage_abort_percent'), fallback=33)
         )
         
         # Load admin configuration
-        admin_section = config['Admin']
+        admin_section = dict(config['Admin'])
         admin_emails_str = admin_section.get('admin_emails', '')
-        self.admin_config = AdminConfig(
+        admin_config = AdminConfig(
             admin_emails=split_email_list(admin_emails_str),
-            send_summary_email=admin_section.getboolean('send_summary_email'),
-            send_error_notifications=admin_section.getboolean('send_error_notifications')
+            send_summary_email=_parse_bool(admin_section.get('send_summary_email')),
+            send_error_notifications=_parse_bool(admin_section.get('send_error_notifications'))
         )
         
         # Load processing configuration
-        processing_section = config['Processing']
+        processing_section = dict(config['Processing'])
         extensions_str = processing_section.get('png_file_extensions', '.png,.PNG')
-        extensions = [ext.strip() for ext in extensions_str.split(',')]
+        extensions = _EXT_RE.findall(extensions_str) or ['.png', '.PNG']
         
-        self.processing_config = ProcessingConfig(
-            png_file_extensions=extensions,
-            archive_after_processing=processing_section.getboolean('archive_after_processing'),
-            override_existing_lock=processing_section.getboolean('override_existing_lock'),
+        processing_config = ProcessingConfig(
+            png_file_extensions=frozenset(ext.lower() for ext in extensions),
+            archive_after_processing=_parse_bool(processing_section.get('archive_after_processing')),
+            override_existing_lock=_parse_bool(processing_section.get('override_existing_lock')),
             date_format=processing_section.get('date_format'),
-            timestamp_format=processing_section.get('timestamp_format')
+            timestamp_format=processing_section.get('timestamp_format'),
+            pdf_max_image_dpi=_parse_int(processing_section.get('pdf_max_image_dpi'), fallback=0),
+            pdf_jpeg_quality=_parse_int(processing_section.get('pdf_jpeg_quality'), fallback=0)
         )
         
+        self._email_config = email_config
+        self._general_config = general_config
+        self._admin_config = admin_config
+        self._processing_config = processing_config
+        
+        _store_cached(_CONFIG_CACHE, cache_key, (email_config, general_config, admin_config, processing_config))
+        
         self.logger.log_file_operation("Settings configuration loaded")
     
     def _load_pdf_names(self):
         """Load PDF names mapping from CSV file."""
-        if not self.pdf_names_file.exists():
-            raise FileNotFoundError(f"PDF names file not found: {self.pdf_names_file}")
+        self._all_pdf_names_cache = None
         
         try:
-            df = pd.read_csv(self.pdf_names_file)
+            cache_key = _cache_key(self.pdf_names_file, "PDF names file")
+            self._loaded_keys[self.pdf_names_file] = cache_key
+            cached = _get_cached(_PDF_NAMES_CACHE, cache_key)
+            if cached is not None:
+                self._pdf_names_mapping = dict(cached)
+                self.logger.log_file_operation("PDF names mapping loaded from cache: %d entries", len(self._pdf_names_mapping))
+                return
             
-            # Validate required columns
-            required_columns = ['FolderName', 'PDFName']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            if missing_columns:
-                raise ValueError(f"Missing required columns in PDF names file: {missing_columns}")
+            rows = _read_csv(self.pdf_names_file, ['FolderName', 'PDFName'], "PDF names file")
             
-            # Create mapping
-            self.pdf_names_mapping = dict(zip(df['FolderName'], df['PDFName']))
+            # Create mapping; PDF names are interned so the mapping and mailing list share one object per name
+            pdf_names_mapping = {row['FolderName']: sys.intern(row['PDFName']) for row in rows}
             
-            self.logger.log_file_operation(f"PDF names mapping loaded: {len(self.pdf_names_mapping)} entries")
+            self._pdf_names_mapping = pdf_names_mapping
+            _store_cached(_PDF_NAMES_CACHE, cache_key, dict(pdf_names_mapping))
+            self.logger.log_file_operation("PDF names mapping loaded: %d entries", len(self._pdf_names_mapping))
             
         except Exception as e:
             self.logger.log_error(f"Failed to load PDF names file: {self.pdf_names_file}", e)
@@ -174,49 +365,60 @@ class ConfigManager:
     
     def _load_mailing_list(self):
         """Load mailing list from CSV file."""
-        if not self.mailing_list_file.exists():
-            raise FileNotFoundError(f"Mailing list file not found: {self.mailing_list_file}")
-        
         try:
-            df = pd.read_csv(self.mailing_list_file)
+            cache_key = _cache_key(self.mailing_list_file, "Mailing list file")
+            self._loaded_keys[self.mailing_list_file] = cache_key
+            cached = _get_cached(_MAILING_LIST_CACHE, cache_key)
+            if cached is not None:
+                self._mailing_list = list(cached)
+                self._build_mailing_index()
+                self.logger.log_file_operation("Mailing list loaded from cache: %d entries", len(self._mailing_list))
+                return
             
-            # Validate required columns
-            required_columns = ['PDFName', 'Recipients', 'Subject']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            if missing_columns:
-                raise ValueError(f"Missing required columns in mailing list file: {missing_columns}")
+            rows = _read_csv(self.mailing_list_file, ['PDFName', 'Recipients', 'Subject'], "mailing list file")
             
-            # Process each row
-            self.mailing_list = []
-            for _, row in df.iterrows():
-                recipients = split_email_list(row['Recipients'])
-                cc = split_email_list(row.get('CC', ''))
-                
-                if not recipients:
-                    self.logger.log_error(f"No valid recipients for PDF: {row['PDFName']}")
-                    continue
-                
-                entry = MailingEntry(
-                    pdf_name=row['PDFName'],
-                    recipients=recipients,
-                    cc=cc,
+            # Process all rows in one pass
+            entries = [
+                MailingEntry(
+                    pdf_name=sys.intern(row['PDFName']),
+                    recipients=split_email_list(row['Recipients']),
+                    cc=split_email_list(row.get('CC', '')),
                     subject=row['Subject']
                 )
-                self.mailing_list.append(entry)
+                for row in rows
+            ]
+            
+            # Drop rows without any valid recipient
+            mailing_list = [entry for entry in entries if entry.recipients]
+            if len(mailing_list) != len(entries):
+                for entry in entries:
+                    if not entry.recipients:
+                        self.logger.log_error(f"No valid recipients for PDF: {entry.pdf_name}")
             
-            self.logger.log_file_operation(f"Mailing list loaded: {len(self.mailing_list)} entries")
+            self._mailing_list = mailing_list
+            _store_cached(_MAILING_LIST_CACHE, cache_key, list(mailing_list))
+            self._build_mailing_index()
+            self.logger.log_file_operation("Mailing list loaded: %d entries", len(self._mailing_list))
             
         except Exception as e:
             self.logger.log_error(f"Failed to load mailing list file: {self.mailing_list_file}", e)
             raise
     
+    def _build_mailing_index(self):
+        """Index mailing entries by PDF name for constant-time lookups."""
+        self._mailing_by_pdf = {}
+        for entry in self._mailing_list:
+            self._mailing_by_pdf.setdefault(entry.pdf_name, []).append(entry)
+    
     def get_pdf_name_for_folder(self, folder_name: str) -> Optional[str]:
         """Get PDF name for a given folder name."""
         return self.pdf_names_mapping.get(folder_name)
     
     def get_mailing_entries_for_pdf(self, pdf_name: str) -> List[MailingEntry]:
         """Get all mailing entries for a given PDF name."""
-        return [entry for entry in self.mailing_list if entry.pdf_name == pdf_name]
+        if self._mailing_list is None:
+            self._load_mailing_list()
+        return self._mailing_by_pdf.get(pdf_name, [])
     
     def get_all_folder_names(self) -> List[str]:
         """Get all configured folder names."""
@@ -224,10 +426,13 @@ class ConfigManager:
     
     def get_all_pdf_names(self) -> List[str]:
         """Get all configured PDF names."""
-        return list(set(self.pdf_names_mapping.values()))
+        if self._all_pdf_names_cache is None:
+            self._all_pdf_names_cache = list(dict.fromkeys(self.pdf_names_mapping.values()))
+        return self._all_pdf_names_cache
     
     def validate_configuration(self) -> Tuple[bool, List[str]]:
         """Validate all configuration settings."""
+        self._load_all_configs()
         errors = []
         
         # Validate email configuration
@@ -253,17 +458,15 @@ class ConfigManager:
             errors.append("No mailing list entries configured")
         
         # Check for orphaned PDF names (in mailing list but not in PDF names mapping)
-        configured_pdf_names = set(self.pdf_names_mapping.values())
-        mailing_pdf_names = set(entry.pdf_name for entry in self.mailing_list)
-        orphaned_pdfs = mailing_pdf_names - configured_pdf_names
+        configured_pdf_names = frozenset(self.get_all_pdf_names())
+        orphaned_pdfs = self._mailing_by_pdf.keys() - configured_pdf_names
         
         if orphaned_pdfs:
             errors.append(f"PDF names in mailing list but not in PDF names mapping: {orphaned_pdfs}")
         
         # Check for missing mailing entries (in PDF names mapping but not in mailing list)
         # Exclude "Global Headers" as it's meant to be included in all PDFs, not sent separately
-        missing_mailing_entries = configured_pdf_names - mailing_pdf_names
-        missing_mailing_entries.discard("Global Headers")  # Remove Global Headers from validation
+        missing_mailing_entries = configured_pdf_names - self._mailing_by_pdf.keys() - {"Global Headers"}
         if missing_mailing_entries:
             errors.append(f"PDF names configured but no mailing entries found: {missing_mailing_entries}")
         
@@ -277,14 +480,53 @@ class ConfigManager:
         
         return is_valid, errors
     
+    def _reset_loaded(self, path: Path):
+        """Forget parsed data for a configuration file so it is re-read on next access."""
+        self._summary_cache = None
+        if path == self.settings_file:
+            self._email_config = None
+            self._general_config = None
+            self._admin_config = None
+            self._processing_config = None
+        elif path == self.pdf_names_file:
+            self._pdf_names_mapping = None
+            self._all_pdf_names_cache = None
+        elif path == self.mailing_list_file:
+            self._mailing_list = None
+            self._mailing_by_pdf = {}
+        self._loaded_keys.pop(path, None)
+    
     def reload_configuration(self):
-        """Reload all configuration files."""
+        """Reload configuration files that changed since they were last loaded."""
         self.logger.log_file_operation("Reloading configuration files")
+        
+        skipped = []
+        for path in (self.settings_file, self.pdf_names_file, self.mailing_list_file):
+            # Same (mtime, size) key as the parse caches, so a same-second edit that
+            # changes the size is still picked up
+            try:
+                current_key = _cache_key(path, path.name)
+            except FileNotFoundError:
+                current_key = None
+            
+            if current_key is not None and self._loaded_keys.get(path) == current_key:
+                skipped.append(path.name)
+                continue
+            
+            _evict_cached(path)
+            self._reset_loaded(path)
+        
+        if skipped:
+            self.logger.log_file_operation("Configuration unchanged, skipped reload of: %s", ', '.join(skipped))
+        
         self._load_all_configs()
     
-    def get_configuration_summary(self) -> Dict:
-        """Get a summary of current configuration."""
-        return {
+    def get_configuration_summary(self) -> Mapping:
+        """Get a read-only summary of current configuration (built once per load)."""
+        if self._summary_cache is not None:
+            return self._summary_cache
+        
+        summary = {
             'email_config': {
                 'use_default_mailer': self.email_config.use_default_mailer,
                 'smtp_server': self.email_config.smtp_server,
@@ -302,7 +544,7 @@ class ConfigManager:
                 'send_error_notifications': self.admin_config.send_error_notifications
             },
             'processing_config': {
-                'png_file_extensions': self.processing_config.png_file_extensions,
+                'png_file_extensions': sorted(self.processing_config.png_file_extensions),
                 'archive_after_processing': self.processing_config.archive_after_processing,
                 'date_format': self.processing_config.date_format
             },
@@ -312,6 +554,11 @@ class ConfigManager:
                 'pdf_names_count': len(self.get_all_pdf_names())
             }
         }
+        
+        self._summary_cache = MappingProxyType(
+            {section: MappingProxyType(details) for section, details in summary.items()}
+        )
+        return self._summary_cache
 
 
 if __name__ == "__main__":
@@ -329,7 +576,7 @@ if __name__ == "__main__":
         print("\nConfiguration Summary:")
         summary = config_manager.get_configuration_summary()
         for section, details in summary.items():
-            print(f"{section}: {details}")
+            print(f"{section}: {dict(details)}")
             
     except Exception as e:
         print(f"Error testing configuration manager: {e}")
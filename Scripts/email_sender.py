@@ -3,27 +3,360 @@ Email sending functionality for BIMailer automation system.
 Handles SMTP and default mailer email sending with comprehensive logging.
 """
 
+import asyncio
+import base64
+import io
+import mmap
+import queue
 import smtplib
+import socket
 import subprocess
+import threading
+import time
+import urllib.parse
+import weakref
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from email.message import EmailMessage, Message
+from email.utils import make_msgid
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
-from email import encoders
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, Iterable, List, Dict, Optional, Tuple, Union
 import datetime
 import os
-from utils import BIMailerLogger, replace_date_placeholders, format_file_size
+from utils import get_logger, format_file_size, get_current_date
 from config_manager import ConfigManager, MailingEntry
 
+# Attachment read size for base64 encoding; a multiple of 57 bytes (one 76-char line)
+BASE64_READ_BLOCK_SIZE = 57 * 1024
+
+# Messages sent on one SMTP connection before it is recycled
+MAX_EMAILS_PER_CONNECTION = 100
+
+# Seconds an unused SMTP connection is kept for reuse; servers drop idle clients soon after
+SMTP_IDLE_TIMEOUT = 60
+
+# Batches at least this large are abandoned once more than a third of sends fail
+BATCH_ABORT_MIN_ENTRIES = 30
+
+# SMTP replies worth retrying (service unavailable / mailbox busy / local error / storage)
+TRANSIENT_SMTP_CODES = frozenset({421, 450, 451, 452})
+SMTP_MAX_RETRIES = 3
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso(value: str) -> Optional[datetime.datetime]:
+    """Parse an ISO-8601 timestamp (accepting a trailing 'Z'); None if it is not one."""
+    try:
+        return datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _format_creation_date(creation_date) -> str:
+    """Format a file's creation date (ISO string or datetime) for the email body."""
+    if isinstance(creation_date, str):
+        parsed = _parse_iso(creation_date)
+        return parsed.strftime('%Y-%m-%d %H:%M') if parsed else creation_date
+    return creation_date.strftime('%Y-%m-%d %H:%M') if creation_date else 'Unknown'
+
+
+@lru_cache(maxsize=64)
+def _quote(text: str) -> str:
+    """URL-encode text for a mailto link; repeated subjects and bodies are encoded once."""
+    return urllib.parse.quote(text)
+
+
+def _build_mailto(recipients: List[str], cc: List[str], subject: str, body: str) -> str:
+    """Build a mailto URL for the default email client."""
+    mailto_url = f"mailto:{';'.join(recipients)}?subject={_quote(subject)}&body={_quote(body)}"
+    if cc:
+        mailto_url += f"&cc={';'.join(cc)}"
+    return mailto_url
+
+
+@lru_cache(maxsize=1)
+def _msgid_domain() -> str:
+    """Host name for Message-IDs; make_msgid would otherwise resolve it on every call."""
+    return socket.getfqdn()
+
+
+def new_message_id() -> str:
+    """Create a Message-ID; a retried send keeps it so logs and mail clients see one message."""
+    return make_msgid(domain=_msgid_domain())
+
+
+@lru_cache(maxsize=8)
+def _render_text_body(from_header: str, to_header: str, cc_header: str, subject: str, body: str) -> bytes:
+    """Serialize a text-only email without its Message-ID; repeated notifications reuse the bytes."""
+    # Single-part message; no multipart boundary needed without an attachment
+    msg = EmailMessage()
+    msg['From'] = from_header
+    msg['To'] = to_header
+    if cc_header:
+        msg['Cc'] = cc_header
+    msg['Subject'] = subject
+    # Quoted-printable keeps non-ASCII text 7-bit clean; an 8bit body would need BODY=8BITMIME
+    msg.set_content(body, cte='quoted-printable')
+    return msg.as_bytes(policy=msg.policy.clone(linesep='\r\n'))
+
+
+def _render_text_message(from_header: str, to_header: str, cc_header: str, subject: str, body: str,
+                         message_id: str) -> bytes:
+    """Serialize a text-only email, stamping the per-message Message-ID onto the cached rendering."""
+    # Header order is not significant (RFC 5322), so the unique header can go first
+    return (b'Message-ID: ' + message_id.encode('ascii') + b'\r\n'
+            + _render_text_body(from_header, to_header, cc_header, subject, body))
+
+
+def _send_on(server: smtplib.SMTP, message: Union[Message, bytes], from_addr: str, to_addrs: List[str]):
+    """Send a Message, or bytes already rendered with CRLF line endings."""
+    if isinstance(message, bytes):
+        server.sendmail(from_addr, to_addrs, message)
+    else:
+        server.send_message(message, from_addr, to_addrs)
+
+
+class SMTPDeliveryUncertain(smtplib.SMTPException):
+    """The connection failed after DATA began, so the server may already have accepted the message."""
+
+
+class _PipeliningMixin:
+    """Send MAIL FROM and every RCPT TO in one write when the server offers PIPELINING (RFC 2920).
+    
+    DATA remains a synchronization point, so only the envelope is batched; replies
+    are read back in order and handled exactly as smtplib.SMTP.sendmail would.
+    data_started tells whether the last sendmail got as far as the DATA command.
+    """
+    
+    data_started = False
+    
+    def data(self, msg):
+        self.data_started = True
+        return super().data(msg)
+    
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()):
+        self.data_started = False
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+        self.ehlo_or_helo_if_needed()
+        if len(to_addrs) < 2 or not self.has_extn('pipelining'):
+            return super().sendmail(from_addr, to_addrs, msg, mail_options, rcpt_options)
+        
+        if isinstance(msg, str):
+            msg = smtplib._fix_eols(msg).encode('ascii')
+        mail_opts = ['size=%d' % len(msg)] if self.has_extn('size') else []
+        mail_opts.extend(mail_options)
+        if any(opt.lower() == 'smtputf8' for opt in mail_opts):
+            if not self.has_extn('smtputf8'):
+                raise smtplib.SMTPNotSupportedError('SMTPUTF8 not supported by server')
+            self.command_encoding = 'utf-8'
+        
+        rcpt_suffix = (' ' + ' '.join(rcpt_options)) if rcpt_options else ''
+        commands = ['mail FROM:%s%s' % (smtplib.quoteaddr(from_addr),
+                                        (' ' + ' '.join(mail_opts)) if mail_opts else '')]
+        commands.extend('rcpt TO:%s%s' % (smtplib.quoteaddr(addr), rcpt_suffix) for addr in to_addrs)
+        for command in commands:
+            # Same guard as SMTP.putcmd: a CR or LF in an address or option would inject a command
+            if '\r' in command or '\n' in command:
+                raise ValueError(f'command and arguments contain prohibited newline characters: {command!r}')
+        self.send(''.join(command + '\r\n' for command in commands))
+        
+        mail_code, mail_resp = self.getreply()
+        rcpt_replies = [self.getreply() for _ in to_addrs]
+        if mail_code != 250:
+            if mail_code == 421:
+                self.close()
+            else:
+                self._rset()
+            raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+        
+        senderrs = {}
+        for addr, (code, resp) in zip(to_addrs, rcpt_replies):
+            if code not in (250, 251):
+                senderrs[addr] = (code, resp)
+            if code == 421:
+                self.close()
+                raise smtplib.SMTPRecipientsRefused(senderrs)
+        if len(senderrs) == len(to_addrs):
+            self._rset()
+            raise smtplib.SMTPRecipientsRefused(senderrs)
+        
+        code, resp = self.data(msg)
+        if code != 250:
+            if code == 421:
+                self.close()
+            else:
+                self._rset()
+            raise smtplib.SMTPDataError(code, resp)
+        return senderrs
+
+
+class PipeliningSMTP(_PipeliningMixin, smtplib.SMTP):
+    """smtplib.SMTP that pipelines the envelope of multi-recipient messages."""
+
+
+class PipeliningSMTP_SSL(_PipeliningMixin, smtplib.SMTP_SSL):
+    """smtplib.SMTP_SSL that pipelines the envelope of multi-recipient messages."""
+
+
+class _BatchOutage:
+    """Counts failed sends for one PDF and trips once the batch should be abandoned.
+    
+    Batches of at least BATCH_ABORT_MIN_ENTRIES stop once more than a third of
+    their sends have failed, instead of spending round-trips on a server that is
+    clearly rejecting.
+    """
+    
+    def __init__(self, total_entries: int):
+        self.total_entries = total_entries
+        self.fail_count = 0
+        self.aborted = threading.Event()
+        self._lock = threading.Lock()
+    
+    def record_failure(self) -> bool:
+        """Count a failed send; True only for the failure that trips the abort."""
+        with self._lock:
+            self.fail_count += 1
+            if (self.total_entries >= BATCH_ABORT_MIN_ENTRIES and self.fail_count > self.total_entries // 3
+                    and not self.aborted.is_set()):
+                self.aborted.set()
+                return True
+            return False
+
+
+class SMTPConnectionPool:
+    """Thread-safe pool of authenticated SMTP connections."""
+    
+    def __init__(self, connect: Callable[[], smtplib.SMTP], size: int = 1,
+                 max_messages: int = MAX_EMAILS_PER_CONNECTION,
+                 connections: Iterable[smtplib.SMTP] = ()):
+        self._connect = connect
+        self._max_messages = max_messages
+        
+        # Each slot holds (server, messages_sent, last_used) or None until first use,
+        # so a batch smaller than the pool never opens unused connections.
+        # Already-authenticated connections handed in fill the first slots.
+        self._idle: queue.Queue = queue.Queue()
+        seeded = [(server, 0, time.monotonic()) for server in connections]
+        for slot in seeded:
+            self._idle.put(slot)
+        for _ in range(max(1, size) - len(seeded)):
+            self._idle.put(None)
+    
+    def send_message(self, message: Union[Message, bytes], from_addr: str, to_addrs: List[str]):
+        """Send a message (or pre-rendered bytes) on a pooled connection.
+        
+        A connection that drops or times out is discarded and the error raised
+        for the caller to retry. If that happened once DATA had begun, the server
+        may have the message already, so SMTPDeliveryUncertain is raised instead.
+        """
+        server, sent, _ = self._acquire()
+        try:
+            _send_on(server, message, from_addr, to_addrs)
+            sent += 1
+        except (smtplib.SMTPServerDisconnected, socket.timeout, ConnectionError) as e:
+            data_started = getattr(server, 'data_started', True)
+            # A reply may still be in flight; drop the connection without waiting on QUIT
+            try:
+                server.close()
+            except Exception:
+                pass
+            server = None
+            if data_started:
+                raise SMTPDeliveryUncertain(f"Connection lost after DATA was sent: {e}") from e
+            raise
+        finally:
+            self._idle.put((server, sent, time.monotonic()) if server is not None else None)
+    
+    def close(self):
+        """Quit every open connection in the pool."""
+        while True:
+            try:
+                slot = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if slot is not None:
+                self._quit(slot[0])
+    
+    def _acquire(self) -> Tuple[smtplib.SMTP, int, float]:
+        """Take a slot from the pool, connecting or recycling it as needed."""
+        slot = self._idle.get()
+        if slot is not None:
+            server, sent, last_used = slot
+            # Past the idle timeout the server has most likely dropped us; don't wait on a NOOP
+            if (sent < self._max_messages and time.monotonic() - last_used < SMTP_IDLE_TIMEOUT
+                    and self._is_alive(server)):
+                return slot
+            self._quit(server)
+        
+        try:
+            return self._connect(), 0, time.monotonic()
+        except Exception:
+            # Give the slot back so other workers are not starved
+            self._idle.put(None)
+            raise
+    
+    @staticmethod
+    def _is_alive(server: smtplib.SMTP) -> bool:
+        """NOOP health check before reusing a connection."""
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+    
+    @staticmethod
+    def _quit(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            pass
+
 
 class EmailSender:
     """Handles email sending functionality."""
     
     def __init__(self, config_manager: ConfigManager):
         self.config = config_manager
-        self.logger = BIMailerLogger()
+        self.logger = get_logger()
+        
+        # Active SMTP connection pool while inside _smtp_session(); shared by
+        # every thread in a session and closed when the last one leaves
+        self._smtp_pool: Optional[SMTPConnectionPool] = None
+        self._session_lock = threading.Lock()
+        self._session_depth = 0
+        
+        # Pool kept open after the last session ends, so a session starting within
+        # SMTP_IDLE_TIMEOUT skips the login; quit by close() or at interpreter exit
+        self._kept_pool: Optional[SMTPConnectionPool] = None
+        self._kept_pool_closer: Optional[weakref.finalize] = None
+        self._kept_since = 0.0
+        
+        # Resolved [DATE] placeholder, refreshed once per batch of sends
+        self._date_str: Optional[str] = None
+        
+        # Outlook COM application, dispatched on first use and reused for every email
+        self._outlook_app = None
+        
+        # Automated default-mailer methods that can succeed on this host, detected once
+        self._default_mailer_methods = self._detect_default_mailer_methods()
+    
+    def open_session(self, connection: Optional[smtplib.SMTP] = None):
+        """Context manager keeping one SMTP login open across every send in the block.
+        
+        Connections are opened on first send, health-checked with NOOP before
+        reuse and reconnected if the server dropped them. An already logged-in
+        connection may be passed in to be used first. When the block ends the
+        connections stay open for SMTP_IDLE_TIMEOUT seconds so a following
+        session can reuse them; close() quits them. No-op for the default mailer.
+        """
+        if self.config.email_config.use_default_mailer:
+            return nullcontext()
+        return self._smtp_session(connection)
     
     def send_pdf_emails(self, pdf_path: Path, pdf_metadata: Dict) -> bool:
         """Send PDF to all configured recipients."""
@@ -46,9 +379,50 @@ class EmailSender:
             
             self.logger.log_email_operation(f"Sending PDF '{pdf_name}' to {total_entries} mailing entries")
             
-            for entry in mailing_entries:
-                if self._send_single_email(pdf_path, pdf_metadata, entry):
-                    success_count += 1
+            # Share one authenticated SMTP connection and one encoded attachment across all mailing entries
+            if self.config.email_config.use_default_mailer:
+                session = nullcontext()
+                attachment_part = None
+            else:
+                session = self._smtp_session()
+                attachment_part = self._build_attachment_part(pdf_path)
+            
+            # Body and subject date depend only on the PDF, so render them once for all entries
+            body = self._generate_email_body(pdf_metadata)
+            self._refresh_placeholders()
+            
+            # Stop early when the server is clearly rejecting, instead of spending round-trips
+            outage = _BatchOutage(total_entries)
+            
+            # Optional event-loop fast path; falls back to smtplib if aiosmtplib is missing
+            # or its session cannot be opened
+            async_count = None
+            if attachment_part is not None and getattr(self.config.email_config, 'async_send', False):
+                async_count = self._send_entries_async(mailing_entries, body, attachment_part, outage, pdf_name)
+            
+            if async_count is not None:
+                success_count = async_count
+            else:
+                def send_entry(entry: MailingEntry) -> bool:
+                    if outage.aborted.is_set():
+                        return False
+                    if self._send_single_email(pdf_path, entry, body, attachment_part):
+                        return True
+                    self._record_send_failure(outage, pdf_name)
+                    return False
+                
+                concurrency = self._get_concurrency()
+                with session:
+                    if concurrency > 1 and total_entries > 1:
+                        # Sends are network-bound; overlap them across pooled connections
+                        with ThreadPoolExecutor(max_workers=min(concurrency, total_entries)) as executor:
+                            success_count = sum(1 for sent in executor.map(send_entry, mailing_entries) if sent)
+                    else:
+                        for entry in mailing_entries:
+                            if outage.aborted.is_set():
+                                break
+                            if send_entry(entry):
+                                success_count += 1
             
             success = success_count == total_entries
             
@@ -67,19 +441,27 @@ class EmailSender:
             self.logger.log_error(f"Failed to send emails for PDF: {pdf_path}", e)
             return False
     
-    def _send_single_email(self, pdf_path: Path, pdf_metadata: Dict, mailing_entry: MailingEntry) -> bool:
+    def _record_send_failure(self, outage: _BatchOutage, pdf_name: str):
+        """Count a failed send, logging once when the batch is abandoned."""
+        if outage.record_failure():
+            self.logger.log_error(
+                f"Aborting sends for PDF: {pdf_name} after {outage.fail_count} failures; "
+                f"remaining mailing entries skipped"
+            )
+    
+    def _send_single_email(self, pdf_path: Path, mailing_entry: MailingEntry, body: str,
+                           attachment_part: Optional[MIMEBase] = None) -> bool:
         """Send email to a single mailing entry."""
         try:
-            # Generate email content
+            # Generate email subject
             subject = self._generate_subject(mailing_entry.subject)
-            body = self._generate_email_body(pdf_metadata)
             
             # Log email attempt
             recipients_str = '; '.join(mailing_entry.recipients)
             cc_str = '; '.join(mailing_entry.cc) if mailing_entry.cc else 'None'
             
             self.logger.log_email_operation(
-                f"Sending email - Subject: '{subject}', Recipients: {recipients_str}, CC: {cc_str}"
+                "Sending email - Subject: '%s', Recipients: %s, CC: %s", subject, recipients_str, cc_str
             )
             
             # Choose email method
@@ -89,12 +471,12 @@ class EmailSender:
                 )
             else:
                 success = self._send_via_smtp(
-                    mailing_entry.recipients, mailing_entry.cc, subject, body, pdf_path
+                    mailing_entry.recipients, mailing_entry.cc, subject, body, pdf_path, attachment_part
                 )
             
             if success:
                 self.logger.log_email_operation(
-                    f"Email sent successfully to: {recipients_str}"
+                    "Email sent successfully to: %s", recipients_str
                 )
             else:
                 self.logger.log_error(
@@ -107,52 +489,21 @@ class EmailSender:
             self.logger.log_error(f"Failed to send single email", e)
             return False
     
-    def _send_via_smtp(self, recipients: List[str], cc: List[str], subject: str, body: str, attachment_path: Path) -> bool:
+    def _send_via_smtp(self, recipients: List[str], cc: List[str], subject: str, body: str, attachment_path: Path,
+                       attachment_part: Optional[MIMEBase] = None) -> bool:
         """Send email via SMTP."""
         try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = f"Glacial Insights <{self.config.email_config.smtp_username}>"
-            msg['To'] = '; '.join(recipients)
-            if cc:
-                msg['Cc'] = '; '.join(cc)
-            msg['Subject'] = subject
-            
-            # Add body
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Add attachment
-            with open(attachment_path, 'rb') as attachment:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(attachment.read())
-            
-            encoders.encode_base64(part)
-            part.add_header(
-                'Content-Disposition',
-                f'attachment; filename= {attachment_path.name}'
-            )
-            msg.attach(part)
-            
-            # Connect to server and send
-            # Check if we should use SSL (port 465) or TLS (port 587)
-            use_ssl = getattr(self.config.email_config, 'use_ssl', False) or self.config.email_config.smtp_port == 465
+            user = self.config.email_config.smtp_username
             
-            if use_ssl:
-                # Use SSL connection (typically port 465)
-                server = smtplib.SMTP_SSL(self.config.email_config.smtp_server, self.config.email_config.smtp_port, timeout=30)
-            else:
-                # Use regular SMTP with optional TLS (typically port 587)
-                server = smtplib.SMTP(self.config.email_config.smtp_server, self.config.email_config.smtp_port, timeout=30)
-                if self.config.email_config.use_tls:
-                    server.starttls()
-            
-            server.login(self.config.email_config.smtp_username, self.config.email_config.smtp_password)
+            # Create message; attachment is prebuilt once per PDF when sending to several entries
+            if attachment_part is None:
+                attachment_part = self._build_attachment_part(attachment_path)
+            msg = self._build_smtp_message(recipients, cc, subject, body, attachment_part)
             
             # Combine recipients and CC for sending
             all_recipients = recipients + cc
-            text = msg.as_string()
-            server.sendmail(self.config.email_config.smtp_username, all_recipients, text)
-            server.quit()
+            
+            self._smtp_send_with_retry(msg, user, all_recipients)
             
             return True
             
@@ -160,37 +511,296 @@ class EmailSender:
             self.logger.log_error(f"SMTP email sending failed", e)
             return False
     
-    def _send_via_default_mailer(self, recipients: List[str], cc: List[str], subject: str, body: str, attachment_path: Path) -> bool:
-        """Send email via default system mailer with attachment support."""
+    def _build_smtp_message(self, recipients: List[str], cc: List[str], subject: str, body: str,
+                            attachment_part: MIMEBase) -> MIMEMultipart:
+        """Assemble the headers, body and attachment of an outgoing message."""
+        msg = MIMEMultipart()
+        msg['From'] = f"Glacial Insights <{self.config.email_config.smtp_username}>"
+        msg['To'] = '; '.join(recipients)
+        if cc:
+            msg['Cc'] = '; '.join(cc)
+        msg['Subject'] = subject
+        msg['Message-ID'] = new_message_id()
+        
+        # Add body
+        msg.attach(MIMEText(body, 'plain'))
+        msg.attach(attachment_part)
+        return msg
+    
+    def _send_entries_async(self, mailing_entries: List[MailingEntry], body: str,
+                            attachment_part: MIMEBase, outage: _BatchOutage, pdf_name: str) -> Optional[int]:
+        """Send all mailing entries over up to email.concurrency aiosmtplib connections.
+        
+        Returns the number of successful sends, or None if aiosmtplib is not
+        installed or no session could be opened, so the caller falls back
+        to the pooled smtplib path.
+        """
         try:
-            recipients_str = ';'.join(recipients)
-            cc_str = ';'.join(cc) if cc else ''
+            import aiosmtplib
+        except ImportError:
+            self.logger.log_email_operation("aiosmtplib not available, using smtplib for sending")
+            return None
+        
+        return asyncio.run(self._send_entries_on_loop(aiosmtplib, mailing_entries, body, attachment_part,
+                                                      outage, pdf_name))
+    
+    async def _send_entries_on_loop(self, aiosmtplib, mailing_entries: List[MailingEntry], body: str,
+                                    attachment_part: MIMEBase, outage: _BatchOutage, pdf_name: str) -> Optional[int]:
+        """Log in on several connections at once, each sending its share of the entries; None if none opened.
+        
+        An SMTP connection carries one transaction at a time, so concurrency
+        comes from the number of connections, one worker coroutine per connection.
+        """
+        connection_count = min(self._get_concurrency(), len(mailing_entries))
+        opened = await asyncio.gather(*[self._open_async_connection(aiosmtplib) for _ in range(connection_count)])
+        servers = [server for server in opened if server is not None]
+        if not servers:
+            self.logger.log_email_operation("aiosmtplib session failed, using smtplib for sending")
+            return None
+        
+        # Workers take entries from one shared iterator; next() never awaits, so no lock is needed
+        pending = iter(mailing_entries)
+        sent_count = 0
+        
+        async def send_worker(server):
+            nonlocal sent_count
+            for entry in pending:
+                if outage.aborted.is_set():
+                    return
+                if await self._send_via_smtp_async(aiosmtplib, server, entry, body, attachment_part, outage, pdf_name):
+                    sent_count += 1
+        
+        try:
+            await asyncio.gather(*[send_worker(server) for server in servers])
+        finally:
+            await asyncio.gather(*[self._quit_async(server) for server in servers])
+        
+        return sent_count
+    
+    async def _open_async_connection(self, aiosmtplib):
+        """Connect and log in with aiosmtplib; None (logged) if that fails."""
+        cfg = self.config.email_config
+        port = cfg.smtp_port
+        use_ssl = getattr(cfg, 'use_ssl', False) or port == 465
+        
+        server = None
+        try:
+            # Versions before aiosmtplib 2.0 reject the start_tls keyword with a TypeError
+            server = aiosmtplib.SMTP(
+                hostname=cfg.smtp_server,
+                port=port,
+                use_tls=use_ssl,
+                start_tls=bool(cfg.use_tls) and not use_ssl,
+                timeout=30
+            )
+            await server.connect()
+            await server.login(cfg.smtp_username, cfg.smtp_password)
+            return server
+        except (aiosmtplib.SMTPException, OSError, TypeError) as e:
+            self.logger.log_email_operation("aiosmtplib connection failed: %s", e)
+            if server is not None:
+                server.close()
+            return None
+    
+    @staticmethod
+    async def _quit_async(server):
+        try:
+            await server.quit()
+        except Exception:
+            pass
+    
+    async def _send_via_smtp_async(self, aiosmtplib, server, mailing_entry: MailingEntry, body: str,
+                                   attachment_part: MIMEBase, outage: _BatchOutage, pdf_name: str) -> bool:
+        """Send email to a single mailing entry on an open aiosmtplib connection."""
+        recipients_str = '; '.join(mailing_entry.recipients)
+        try:
+            subject = self._generate_subject(mailing_entry.subject)
             
-            # Try different methods to send with attachment
-            success = False
+            cc_str = '; '.join(mailing_entry.cc) if mailing_entry.cc else 'None'
+            self.logger.log_email_operation(
+                "Sending email - Subject: '%s', Recipients: %s, CC: %s", subject, recipients_str, cc_str
+            )
             
-            # Method 1: Try Outlook automation (Windows)
-            if os.name == 'nt':  # Windows
-                success = self._try_outlook_automation(recipients, cc, subject, body, attachment_path)
-                if success:
-                    self.logger.log_email_operation(f"Email sent via Outlook automation with attachment: {attachment_path.name}")
-                    return True
+            msg = self._build_smtp_message(mailing_entry.recipients, mailing_entry.cc, subject, body, attachment_part)
+            await self._smtp_send_with_retry_async(
+                aiosmtplib, server, msg, self.config.email_config.smtp_username,
+                mailing_entry.recipients + mailing_entry.cc
+            )
             
-            # Method 2: Try PowerShell Send-MailMessage (Windows)
-            if os.name == 'nt':
-                success = self._try_powershell_email(recipients, cc, subject, body, attachment_path)
-                if success:
-                    self.logger.log_email_operation(f"Email sent via PowerShell with attachment: {attachment_path.name}")
-                    return True
+            self.logger.log_email_operation("Email sent successfully to: %s", recipients_str)
+            return True
             
-            # Method 3: Try mapi32 (Windows)
-            if os.name == 'nt':
-                success = self._try_mapi_email(recipients, cc, subject, body, attachment_path)
-                if success:
-                    self.logger.log_email_operation(f"Email sent via MAPI with attachment: {attachment_path.name}")
+        except Exception as e:
+            self.logger.log_error(f"Failed to send email to: {recipients_str}", e)
+            self._record_send_failure(outage, pdf_name)
+            return False
+    
+    async def _smtp_send_with_retry_async(self, aiosmtplib, server, message: Message, from_addr: str,
+                                          to_addrs: List[str]):
+        """Event-loop counterpart of _smtp_send_with_retry.
+        
+        aiosmtplib does not report whether a dropped connection had reached
+        DATA, so only explicit transient 4xx refusals are retried here.
+        """
+        for attempt in range(SMTP_MAX_RETRIES + 1):
+            try:
+                await server.send_message(message, sender=from_addr, recipients=to_addrs)
+                return
+            except aiosmtplib.SMTPResponseException as e:
+                if e.code not in TRANSIENT_SMTP_CODES or attempt == SMTP_MAX_RETRIES:
+                    raise
+                delay = 2 ** attempt
+                self.logger.log_email_operation(
+                    "Transient SMTP error %s, retrying in %ds (attempt %d/%d)",
+                    e.code, delay, attempt + 1, SMTP_MAX_RETRIES
+                )
+                await asyncio.sleep(delay)
+    
+    def _build_attachment_part(self, attachment_path: Path) -> MIMEBase:
+        """Read and base64-encode an attachment into a reusable MIME part."""
+        part = MIMEBase('application', 'octet-stream')
+        part.set_payload(self._encoded_attachment(attachment_path))
+        part['Content-Transfer-Encoding'] = 'base64'
+        part.add_header(
+            'Content-Disposition',
+            f'attachment; filename= {attachment_path.name}'
+        )
+        return part
+    
+    def _encoded_attachment(self, attachment_path: Path) -> str:
+        """Base64-encode a file in fixed-size blocks into 76-character MIME lines."""
+        # Blocks are a multiple of 57 bytes so each encodes to whole 76-char lines (RFC 2045)
+        encoded_lines = []
+        with open(attachment_path, 'rb') as attachment:
+            size = os.fstat(attachment.fileno()).st_size
+            if size == 0:
+                return ''
+            
+            # Map the file read-only so blocks are served from the page cache without a read() copy
+            with mmap.mmap(attachment.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for offset in range(0, size, BASE64_READ_BLOCK_SIZE):
+                    block = mapped[offset:offset + BASE64_READ_BLOCK_SIZE]
+                    encoded_lines.append(base64.encodebytes(block).decode('ascii'))
+        return ''.join(encoded_lines)
+    
+    def _connect_smtp(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP connection."""
+        cfg = self.config.email_config
+        server_addr, port, user, pw = cfg.smtp_server, cfg.smtp_port, cfg.smtp_username, cfg.smtp_password
+        
+        # Check if we should use SSL (port 465) or TLS (port 587)
+        use_ssl = getattr(cfg, 'use_ssl', False) or port == 465
+        
+        if use_ssl:
+            # Use SSL connection (typically port 465)
+            server = PipeliningSMTP_SSL(server_addr, port, timeout=30)
+        else:
+            # Use regular SMTP with optional TLS (typically port 587)
+            server = PipeliningSMTP(server_addr, port, timeout=30)
+            if cfg.use_tls:
+                server.starttls()
+        
+        server.login(user, pw)
+        return server
+    
+    def _get_concurrency(self) -> int:
+        """Number of parallel SMTP connections to use (1 when using the default mailer)."""
+        if self.config.email_config.use_default_mailer:
+            return 1
+        return max(1, getattr(self.config.email_config, 'concurrency', 1) or 1)
+    
+    @contextmanager
+    def _smtp_session(self, connection: Optional[smtplib.SMTP] = None):
+        """Keep pooled SMTP connections open for every send inside the block.
+        
+        Nested or concurrent sessions reuse the open pool (and ignore connection).
+        """
+        expired = None
+        with self._session_lock:
+            if self._smtp_pool is None:
+                kept = self._take_kept_pool()
+                if kept is not None and connection is None and time.monotonic() - self._kept_since < SMTP_IDLE_TIMEOUT:
+                    self._smtp_pool = kept
+                else:
+                    expired = kept
+                    self._smtp_pool = SMTPConnectionPool(
+                        self._connect_smtp, self._get_concurrency(),
+                        connections=[connection] if connection is not None else ()
+                    )
+            self._session_depth += 1
+            pool = self._smtp_pool
+        
+        if expired is not None:
+            expired.close()
+        
+        try:
+            yield pool
+        finally:
+            with self._session_lock:
+                self._session_depth -= 1
+                if self._session_depth == 0:
+                    # Keep the logged-in connections for a session that follows shortly
+                    self._smtp_pool = None
+                    self._kept_pool, self._kept_since = pool, time.monotonic()
+                    self._kept_pool_closer = weakref.finalize(self, pool.close)
+    
+    def _take_kept_pool(self) -> Optional[SMTPConnectionPool]:
+        """Detach and return the pool kept from the previous session (call with _session_lock held)."""
+        pool, self._kept_pool = self._kept_pool, None
+        if self._kept_pool_closer is not None:
+            self._kept_pool_closer.detach()
+            self._kept_pool_closer = None
+        return pool
+    
+    def close(self):
+        """Quit SMTP connections kept open between sessions."""
+        with self._session_lock:
+            pool = self._take_kept_pool()
+        if pool is not None:
+            pool.close()
+    
+    def _smtp_send_message(self, message: Union[Message, bytes], from_addr: str, to_addrs: List[str]):
+        """Send a message on the active session, or on a one-off connection if none is open."""
+        with self._smtp_session() as pool:
+            pool.send_message(message, from_addr, to_addrs)
+    
+    def _smtp_send_with_retry(self, message: Union[Message, bytes], from_addr: str, to_addrs: List[str]):
+        """Send a message, retrying transient failures with exponential backoff.
+        
+        This is the only retry layer. Transient means a 4xx reply in
+        TRANSIENT_SMTP_CODES (the server refused the message, so resending
+        cannot duplicate it) or a connection dropped or timed out before DATA.
+        A failure after DATA began (SMTPDeliveryUncertain) and permanent 5xx
+        rejections are raised at once. The Message-ID is the same on every
+        attempt, but receivers do not deduplicate on it, so only these
+        retry conditions keep a message from being delivered twice.
+        """
+        for attempt in range(SMTP_MAX_RETRIES + 1):
+            try:
+                self._smtp_send_message(message, from_addr, to_addrs)
+                return
+            except (smtplib.SMTPResponseException, smtplib.SMTPServerDisconnected, socket.timeout,
+                    ConnectionError) as e:
+                code = getattr(e, 'smtp_code', None)
+                if (code is not None and code not in TRANSIENT_SMTP_CODES) or attempt == SMTP_MAX_RETRIES:
+                    raise
+                delay = 2 ** attempt
+                self.logger.log_email_operation(
+                    "Transient SMTP error %s, retrying in %ds (attempt %d/%d)",
+                    code or type(e).__name__, delay, attempt + 1, SMTP_MAX_RETRIES
+                )
+                time.sleep(delay)
+    
+    def _send_via_default_mailer(self, recipients: List[str], cc: List[str], subject: str, body: str, attachment_path: Path) -> bool:
+        """Send email via default system mailer with attachment support."""
+        try:
+            # Try the methods that can send with attachment on this host
+            for method_name, method in self._default_mailer_methods:
+                if method(recipients, cc, subject, body, attachment_path):
+                    self.logger.log_email_operation(f"Email sent via {method_name} with attachment: {attachment_path.name}")
                     return True
             
-            # Method 4: Fallback - Open email client and show instructions
+            # Fallback - Open email client and show instructions
             self._open_email_with_instructions(recipients, cc, subject, body, attachment_path)
             
             return True  # We opened the client, user needs to attach manually
@@ -199,13 +809,29 @@ class EmailSender:
             self.logger.log_error(f"Default mailer email failed", e)
             return False
     
+    def _detect_default_mailer_methods(self) -> List[Tuple[str, Callable[..., bool]]]:
+        """List the automated default-mailer methods usable on this host."""
+        methods = []
+        
+        # Outlook automation needs Windows and pywin32
+        if os.name == 'nt':
+            try:
+                import win32com.client  # noqa: F401
+                methods.append(("Outlook automation", self._try_outlook_automation))
+            except ImportError:
+                self.logger.log_email_operation("pywin32 not available for Outlook automation")
+        
+        # PowerShell and MAPI sending are not implemented yet (they always return False), so are not tried
+        return methods
+    
     def _try_outlook_automation(self, recipients: List[str], cc: List[str], subject: str, body: str, attachment_path: Path) -> bool:
         """Try to send email using Outlook automation."""
         try:
-            import win32com.client
+            if self._outlook_app is None:
+                import win32com.client
+                self._outlook_app = win32com.client.Dispatch("Outlook.Application")
             
-            outlook = win32com.client.Dispatch("Outlook.Application")
-            mail = outlook.CreateItem(0)  # 0 = olMailItem
+            mail = self._outlook_app.CreateItem(0)  # 0 = olMailItem
             
             mail.To = ';'.join(recipients)
             if cc:
@@ -225,6 +851,8 @@ class EmailSender:
             self.logger.log_email_operation("pywin32 not available for Outlook automation")
             return False
         except Exception as e:
+            # Drop the cached application in case Outlook was closed; re-dispatch next time
+            self._outlook_app = None
             self.logger.log_email_operation(f"Outlook automation failed: {e}")
             return False
     
@@ -269,30 +897,12 @@ Location: {attachment_path.absolute()}
 The file has been created and is ready for attachment.
 """
             
-            # URL encode the subject and body
-            import urllib.parse
-            encoded_subject = urllib.parse.quote(subject)
-            encoded_body = urllib.parse.quote(enhanced_body)
-            
-            recipients_str = ';'.join(recipients)
-            cc_str = ';'.join(cc) if cc else ''
-            
-            mailto_url = f"mailto:{recipients_str}?subject={encoded_subject}&body={encoded_body}"
-            
-            if cc_str:
-                mailto_url += f"&cc={cc_str}"
-            
             # Open default email client
-            webbrowser.open(mailto_url)
+            webbrowser.open(_build_mailto(recipients, cc, subject, enhanced_body))
             
-            # Also try to open the file location
-            try:
-                if os.name == 'nt':  # Windows
-                    subprocess.run(['explorer', '/select,', str(attachment_path.absolute())], check=False)
-                elif os.name == 'posix':  # macOS/Linux
-                    subprocess.run(['open', '-R', str(attachment_path.absolute())], check=False)
-            except:
-                pass  # If file explorer fails, continue anyway
+            # Also try to open the file location (fire-and-forget; skipped for headless runs)
+            if getattr(self.config.email_config, 'reveal_attachment', False):
+                self._reveal_attachment(attachment_path)
             
             self.logger.log_email_operation(
                 f"Email client opened with attachment instructions. File location: {attachment_path.absolute()}"
@@ -313,33 +923,53 @@ The file has been created and is ready for attachment.
         except Exception as e:
             self.logger.log_error(f"Failed to open email with instructions", e)
     
+    def _reveal_attachment(self, attachment_path: Path):
+        """Show the attachment in the system file browser without waiting for it."""
+        try:
+            if os.name == 'nt':  # Windows
+                subprocess.Popen(
+                    ['explorer', '/select,', str(attachment_path.absolute())],
+                    close_fds=True,
+                    creationflags=subprocess.DETACHED_PROCESS
+                )
+            elif os.name == 'posix':  # macOS/Linux
+                subprocess.Popen(
+                    ['open', '-R', str(attachment_path.absolute())],
+                    close_fds=True,
+                    start_new_session=True
+                )
+        except Exception:
+            pass  # If file explorer fails, continue anyway
+    
     def _generate_subject(self, subject_template: str) -> str:
         """Generate email subject with date placeholders replaced."""
-        return replace_date_placeholders(subject_template, self.config.processing_config.date_format)
+        return self._apply_placeholders(subject_template)
+    
+    def _refresh_placeholders(self):
+        """Resolve placeholder values once for the upcoming batch of sends."""
+        self._date_str = get_current_date(self.config.processing_config.date_format)
+    
+    def _apply_placeholders(self, template: str) -> str:
+        """Replace [DATE] with the value resolved by _refresh_placeholders."""
+        if self._date_str is None:
+            self._refresh_placeholders()
+        return template.replace('[DATE]', self._date_str)
     
     def _generate_email_body(self, pdf_metadata: Dict) -> str:
         """Generate email body from PDF metadata."""
         try:
             pdf_name = pdf_metadata.get('pdf_name', 'Report')
-            creation_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            current_date = datetime.datetime.now().strftime(self.config.processing_config.date_format)
+            now = datetime.datetime.now()
+            creation_time = now.strftime('%Y-%m-%d %H:%M:%S')
+            current_date = now.strftime(self.config.processing_config.date_format)
             
             # Generate file list with dates
-            file_list = []
-            for file_info in pdf_metadata.get('files', []):
-                filename = file_info.get('filename', 'Unknown')
-                creation_date = file_info.get('creation_date', 'Unknown')
-                if isinstance(creation_date, str):
-                    try:
-                        creation_date = datetime.datetime.fromisoformat(creation_date.replace('Z', '+00:00'))
-                        creation_date_str = creation_date.strftime('%Y-%m-%d %H:%M')
-                    except:
-                        creation_date_str = str(creation_date)
-                else:
-                    creation_date_str = creation_date.strftime('%Y-%m-%d %H:%M') if creation_date else 'Unknown'
-                
-                dimensions = file_info.get('dimensions', 'Unknown')
-                file_list.append(f"  • {filename} (Created: {creation_date_str}, Size: {dimensions})")
+            file_list = [
+                f"  • {file_info.get('filename', 'Unknown')} "
+                f"(Created: {_format_creation_date(file_info.get('creation_date', 'Unknown'))}, "
+                f"Size: {file_info.get('dimensions', 'Unknown')})"
+                for file_info in pdf_metadata.get('files', [])
+            ]
             
             file_list_text = '\n'.join(file_list) if file_list else '  • No file details available'
             
@@ -383,8 +1013,13 @@ Automated Reporting System"""
             self.logger.log_error(f"Failed to validate attachment size: {attachment_path}", e)
             return False
     
-    def send_admin_notification(self, subject: str, body: str, is_error: bool = False) -> bool:
-        """Send notification email to administrators."""
+    def send_admin_notification(self, subject: str, body: str, is_error: bool = False,
+                                message_id: Optional[str] = None) -> bool:
+        """Send notification email to administrators.
+        
+        Pass message_id (see new_message_id) to keep the same Message-ID when the
+        caller itself retries the notification.
+        """
         try:
             if is_error and not self.config.admin_config.send_error_notifications:
                 return True
@@ -405,7 +1040,7 @@ Automated Reporting System"""
             )
             
             # Send email without attachment
-            success = self._send_admin_email_only(admin_entry, body)
+            success = self._send_admin_email_only(admin_entry, body, message_id)
             
             if success:
                 self.logger.log_email_operation(f"Admin notification sent: {subject}")
@@ -418,9 +1053,11 @@ Automated Reporting System"""
             self.logger.log_error(f"Failed to send admin notification", e)
             return False
     
-    def _send_admin_email_only(self, mailing_entry: MailingEntry, body: str) -> bool:
+    def _send_admin_email_only(self, mailing_entry: MailingEntry, body: str,
+                               message_id: Optional[str] = None) -> bool:
         """Send email without attachment (for admin notifications)."""
         try:
+            self._refresh_placeholders()
             subject = self._generate_subject(mailing_entry.subject)
             
             if self.config.email_config.use_default_mailer:
@@ -429,43 +1066,26 @@ Automated Reporting System"""
                 )
             else:
                 return self._send_text_via_smtp(
-                    mailing_entry.recipients, mailing_entry.cc, subject, body
+                    mailing_entry.recipients, mailing_entry.cc, subject, body, message_id
                 )
                 
         except Exception as e:
             self.logger.log_error("Failed to send admin email", e)
             return False
     
-    def _send_text_via_smtp(self, recipients: List[str], cc: List[str], subject: str, body: str) -> bool:
+    def _send_text_via_smtp(self, recipients: List[str], cc: List[str], subject: str, body: str,
+                            message_id: Optional[str] = None) -> bool:
         """Send text-only email via SMTP."""
         try:
-            msg = MIMEMultipart()
-            msg['From'] = f"Glacial Insights <{self.config.email_config.smtp_username}>"
-            msg['To'] = '; '.join(recipients)
-            if cc:
-                msg['Cc'] = '; '.join(cc)
-            msg['Subject'] = subject
-            
-            msg.attach(MIMEText(body, 'plain'))
+            user = self.config.email_config.smtp_username
             
-            # Check if we should use SSL (port 465) or TLS (port 587)
-            use_ssl = getattr(self.config.email_config, 'use_ssl', False) or self.config.email_config.smtp_port == 465
-            
-            if use_ssl:
-                # Use SSL connection (typically port 465)
-                server = smtplib.SMTP_SSL(self.config.email_config.smtp_server, self.config.email_config.smtp_port, timeout=30)
-            else:
-                # Use regular SMTP with optional TLS (typically port 587)
-                server = smtplib.SMTP(self.config.email_config.smtp_server, self.config.email_config.smtp_port, timeout=30)
-                if self.config.email_config.use_tls:
-                    server.starttls()
-            
-            server.login(self.config.email_config.smtp_username, self.config.email_config.smtp_password)
+            msg = _render_text_message(
+                f"Glacial Insights <{user}>", '; '.join(recipients), '; '.join(cc), subject, body,
+                message_id or new_message_id()
+            )
             
             all_recipients = recipients + cc
-            text = msg.as_string()
-            server.sendmail(self.config.email_config.smtp_username, all_recipients, text)
-            server.quit()
+            self._smtp_send_with_retry(msg, user, all_recipients)
             
             return True
             
@@ -476,19 +1096,7 @@ Automated Reporting System"""
     def _send_text_via_default_mailer(self, recipients: List[str], cc: List[str], subject: str, body: str) -> bool:
         """Send text-only email via default mailer."""
         try:
-            recipients_str = ';'.join(recipients)
-            cc_str = ';'.join(cc) if cc else ''
-            
-            import urllib.parse
-            encoded_subject = urllib.parse.quote(subject)
-            encoded_body = urllib.parse.quote(body)
-            
-            mailto_url = f"mailto:{recipients_str}?subject={encoded_subject}&body={encoded_body}"
-            
-            if cc_str:
-                mailto_url += f"&cc={cc_str}"
-            
-            webbrowser.open(mailto_url)
+            webbrowser.open(_build_mailto(recipients, cc, subject, body))
             return True
             
         except Exception as e:
@@ -497,21 +1105,25 @@ Automated Reporting System"""
     
     def generate_processing_summary(self, results: Dict) -> str:
         """Generate processing summary for admin notification."""
+        return self.generate_processing_summary_compact([
+            (folder, result.get('pdf_created'), result.get('emails_sent'), result.get('error'))
+            for folder, result in results.items()
+        ])
+    
+    def generate_processing_summary_compact(self, results: List[Tuple[str, bool, bool, Optional[str]]]) -> str:
+        """Generate the admin summary from (folder, pdf_created, emails_sent, error) tuples."""
         try:
             timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
             # Count results
             total_folders = len(results)
-            successful_pdfs = len([r for r in results.values() if r.get('pdf_created')])
-            successful_emails = len([r for r in results.values() if r.get('emails_sent')])
-            errors = []
-            
-            for folder, result in results.items():
-                if result.get('error'):
-                    errors.append(f"  • {folder}: {result['error']}")
+            successful_pdfs = sum(1 for _, pdf_created, _, _ in results if pdf_created)
+            successful_emails = sum(1 for _, _, emails_sent, _ in results if emails_sent)
+            errors = [f"  • {folder}: {error}" for folder, _, _, error in results if error]
             
             # Generate summary
-            summary = f"""BIMailer Processing Summary - {timestamp}
+            summary = io.StringIO()
+            summary.write(f"""BIMailer Processing Summary - {timestamp}
 
 Processing completed at: {timestamp}
 
@@ -521,25 +1133,24 @@ Summary:
 - Emails sent: {successful_emails}
 - Errors encountered: {len(errors)}
 
-Detailed Results:"""
+Detailed Results:""")
             
-            for folder, result in results.items():
-                pdf_status = "✓" if result.get('pdf_created') else "✗"
-                email_status = "✓" if result.get('emails_sent') else "✗"
-                summary += f"\n  • {folder}: PDF {pdf_status}, Email {email_status}"
+            for folder, pdf_created, emails_sent, _ in results:
+                pdf_status = "✓" if pdf_created else "✗"
+                email_status = "✓" if emails_sent else "✗"
+                summary.write(f"\n  • {folder}: PDF {pdf_status}, Email {email_status}")
             
             if errors:
-                summary += f"\n\nErrors:\n" + '\n'.join(errors)
+                summary.write("\n\nErrors:\n" + '\n'.join(errors))
             
-            summary += f"\n\nFull logs available in the Logs directory."
+            summary.write("\n\nFull logs available in the Logs directory.")
             
-            return summary
+            return summary.getvalue()
             
         except Exception as e:
             self.logger.log_error("Failed to generate processing summary", e)
             return f"Processing completed at {datetime.datetime.now()}, but summary generation failed."
 
-
 if __name__ == "__main__":
     # Test the email sender
     try:
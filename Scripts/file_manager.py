@@ -3,21 +3,145 @@ File management and archiving functionality for BIMailer automation system.
 Handles file operations, archiving, and cleanup with comprehensive logging.
 """
 
+import errno
+import json
 import shutil
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Iterable, Iterator, List, Dict, Optional, Set, Tuple, Union
 import datetime
 import os
-from utils import BIMailerLogger, get_current_timestamp, ensure_directory_exists
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils import get_logger, get_current_timestamp, ensure_directory_exists, scan_png_files
 from config_manager import ConfigManager
 
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; copies fall back to shutil.copy2
+    fcntl = None
+
+# Worker threads used to move PNGs into the archive in parallel
+ARCHIVE_MOVE_WORKERS = 8
+
+# Archive index of folder name -> last processing time (ISO format)
+LAST_PROCESSED_INDEX_NAME = ".last_processed.json"
+
+# Append-only log of "<mtime>\t<path>" for every archived file, used by retention cleanup;
+# paths are relative to the archive directory so the log works from any working directory
+EXPIRY_LOG_NAME = ".expiry.log"
+
+# Marker written once the expiry log has been seeded from a full archive scan;
+# until it exists the log may miss files archived before it was introduced
+EXPIRY_LOG_SEEDED_NAME = ".expiry.seeded"
+
+# os.link failures that mean "hard links not possible here" rather than a real error
+LINK_FALLBACK_ERRNOS = frozenset(
+    code for code in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EINVAL, getattr(errno, 'ENOTSUP', None),
+                      getattr(errno, 'EOPNOTSUPP', None), getattr(errno, 'ENOSYS', None))
+    if code is not None
+)
+
+# Windows errors for the same case (ERROR_INVALID_FUNCTION on FAT/exFAT and some network shares)
+LINK_FALLBACK_WINERRORS = frozenset({1})
+
+# Pause between delete batches when cleanup_delete_qps is configured
+CLEANUP_BATCH_INTERVAL_MS = 100
+
+# Linux ioctl request for a copy-on-write file clone (Btrfs, XFS)
+FICLONE = getattr(fcntl, 'FICLONE', 0x40049409) if fcntl else None
+
+
+def _scandir_recursive(path) -> Iterator[os.DirEntry]:
+    """Yield every entry below path, depth-first, without extra stat() calls.
+    
+    DirEntry.is_file/is_dir use the type cached by readdir(), and entry.stat()
+    is cached after the first call, so each entry costs at most one stat().
+    """
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                yield entry
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _scandir_recursive(entry.path)
+    except FileNotFoundError:
+        # Directory removed while scanning
+        return
+
+
+def _iter_file_sizes(path) -> Iterator[int]:
+    """Yield the size in bytes of every regular file below path."""
+    for entry in _scandir_recursive(path):
+        if entry.is_file(follow_symlinks=False):
+            try:
+                yield entry.stat().st_size
+            except FileNotFoundError:
+                # File removed while scanning
+                continue
+
+
+def _move_file(source: Union[str, Path], destination: Union[str, Path]):
+    """Move a file, renaming in place when source and destination share a filesystem."""
+    try:
+        os.replace(source, destination)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        # Cross-device move needs a copy + delete
+        shutil.move(str(source), str(destination))
+
+
+def _archive_files(moves: List[Tuple[Path, Path]]):
+    """Archive a group of files together via hard links.
+    
+    Every destination is linked before any source is unlinked, so a crash never
+    leaves a file archived without its sidecar, and os.link refuses to
+    overwrite an existing destination. Falls back to _move_file where hard
+    links are unavailable (cross-device, unsupported filesystem).
+    """
+    linked = []
+    try:
+        for source, destination in moves:
+            os.link(source, destination)
+            linked.append(destination)
+    except OSError as e:
+        # Roll back partial links so the group stays all-or-nothing
+        for destination in linked:
+            os.unlink(destination)
+        if (e.errno not in LINK_FALLBACK_ERRNOS
+                and getattr(e, 'winerror', None) not in LINK_FALLBACK_WINERRORS):
+            raise
+        for source, destination in moves:
+            _move_file(source, destination)
+        return
+    
+    for source, _ in moves:
+        os.unlink(source)
+
+
+def _fast_copy(source: Path, destination: Path):
+    """Copy a file with metadata, cloning it copy-on-write when the filesystem supports it."""
+    if FICLONE is not None:
+        try:
+            with open(source, 'rb') as src, open(destination, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            shutil.copystat(source, destination)
+            return
+        except OSError:
+            # Filesystem cannot clone (or cross-device); fall back to a regular copy
+            pass
+    
+    # copy2 uses the kernel's zero-copy path (sendfile) where available
+    shutil.copy2(str(source), str(destination))
+
 
 class FileManager:
     """Handles file operations and archiving."""
     
     def __init__(self, config_manager: ConfigManager):
         self.config = config_manager
-        self.logger = BIMailerLogger()
+        self.logger = get_logger()
         
         # Directory paths - handle running from Scripts directory
         base_path = Path("..") if not Path("Input").exists() and Path("../Input").exists() else Path(".")
@@ -25,60 +149,111 @@ class FileManager:
         self.input_dir = base_path / "Input"
         self.output_dir = base_path / "Output/PDFs"
         self.archive_dir = base_path / "Archive"
-        self.png_archive_dir = self.archive_dir / "PNGs"
-        self.pdf_archive_dir = self.archive_dir / "PDFs"
+        self._png_archive_dir = self.archive_dir / "PNGs"
+        self._pdf_archive_dir = self.archive_dir / "PDFs"
+        self.last_processed_index_path = self.archive_dir / LAST_PROCESSED_INDEX_NAME
+        self.expiry_log_path = self.archive_dir / EXPIRY_LOG_NAME
+        self.expiry_log_seeded_path = self.archive_dir / EXPIRY_LOG_SEEDED_NAME
+        
+        # Plain string forms for os-level calls in per-file loops (no Path joins / __fspath__)
+        self.png_archive_dir_s = str(self._png_archive_dir)
+        
+        # Loaded lazily from last_processed_index_path
+        self._last_processed_index: Optional[Dict[str, str]] = None
+        
+        # Serializes index and expiry-log writes when folders are archived concurrently
+        self._bookkeeping_lock = threading.Lock()
+        
+        # Directories known to exist, so repeat archives skip the mkdir syscalls
+        self._mkdir_cache: Set[str] = set()
+        
+        # Archive directories are created on first use, not at startup, so runs
+        # with archiving disabled never touch them
+        self._png_archive_ready = False
+        self._pdf_archive_ready = False
+    
+    @property
+    def png_archive_dir(self) -> Path:
+        """PNG archive directory, created on first access."""
+        if not self._png_archive_ready:
+            ensure_directory_exists(self._png_archive_dir)
+            self._png_archive_ready = True
+        return self._png_archive_dir
+    
+    @property
+    def pdf_archive_dir(self) -> Path:
+        """PDF archive directory, created on first access."""
+        if not self._pdf_archive_ready:
+            ensure_directory_exists(self._pdf_archive_dir)
+            self._pdf_archive_ready = True
+        return self._pdf_archive_dir
+    
+    def archive_folder(self, folder_name: str, pdf_path: Path) -> bool:
+        """Archive a sent PDF and its folder's PNGs in one pass.
+        
+        Reads the clock once and appends both sets of files to the expiry log in a single write.
+        """
+        if not self.config.processing_config.archive_after_processing:
+            self.logger.log_file_operation("Archiving disabled in configuration")
+            return True
         
-        # Ensure archive directories exist
-        ensure_directory_exists(self.png_archive_dir)
-        ensure_directory_exists(self.pdf_archive_dir)
+        current_date = datetime.datetime.now()
+        expiry_entries: List[Tuple[float, str]] = []
+        
+        pdf_archived = self._archive_pdf(pdf_path, current_date, expiry_entries)
+        pngs_archived = self._archive_pngs(folder_name, current_date, expiry_entries)
+        
+        self._append_expiry_log(expiry_entries)
+        return pdf_archived and pngs_archived
     
     def archive_processed_pngs(self, folder_name: str) -> bool:
         """Archive PNG files after successful PDF creation."""
+        if not self.config.processing_config.archive_after_processing:
+            self.logger.log_file_operation("Archiving disabled in configuration")
+            return True
+        
+        expiry_entries: List[Tuple[float, str]] = []
+        archived = self._archive_pngs(folder_name, datetime.datetime.now(), expiry_entries)
+        self._append_expiry_log(expiry_entries)
+        return archived
+    
+    def _archive_pngs(self, folder_name: str, current_date: datetime.datetime,
+                      expiry_entries: List[Tuple[float, str]]) -> bool:
+        """Move a folder's PNGs into a dated batch folder, adding them to expiry_entries."""
         try:
-            if not self.config.processing_config.archive_after_processing:
-                self.logger.log_file_operation("Archiving disabled in configuration")
-                return True
-            
             folder_path = self.input_dir / folder_name
             if not folder_path.exists():
                 self.logger.log_error(f"Source folder does not exist: {folder_path}")
                 return False
             
             # Get PNG files to archive
-            png_extensions = self.config.processing_config.png_file_extensions
-            png_files = []
-            for ext in png_extensions:
-                png_files.extend(folder_path.glob(f'*{ext}'))
+            png_files = self._list_pngs(folder_path)
             
             if not png_files:
                 self.logger.log_file_operation(f"No PNG files to archive in folder: {folder_name}")
                 return True
             
-            # Create archive directory structure (Year/Month)
-            current_date = datetime.datetime.now()
-            archive_folder = self.png_archive_dir / str(current_date.year) / f"{current_date.month:02d}"
-            ensure_directory_exists(archive_folder)
+            # Create archive directory structure (Year/Month) with a subfolder for this processing batch;
+            # the clock is read once so folder, batch name and index all agree
+            timestamp = current_date.strftime(self.config.processing_config.timestamp_format)
+            batch_folder = os.path.join(
+                self.png_archive_dir_s, str(current_date.year), f"{current_date.month:02d}", f"{folder_name}_{timestamp}"
+            )
+            self._ensure_archive_dir(batch_folder)
             
-            # Create subfolder for this processing batch
-            timestamp = get_current_timestamp(self.config.processing_config.timestamp_format)
-            batch_folder = archive_folder / f"{folder_name}_{timestamp}"
-            ensure_directory_exists(batch_folder)
+            # Archive each PNG file; moves are independent, so overlap their syscalls
+            with ThreadPoolExecutor(max_workers=min(ARCHIVE_MOVE_WORKERS, len(png_files))) as executor:
+                archived = [result for result in executor.map(
+                    lambda png_file: self._archive_png(png_file, batch_folder), png_files
+                ) if result]
+            archived_count = len(archived)
             
-            # Archive each PNG file
-            archived_count = 0
-            for png_file in png_files:
-                try:
-                    destination = batch_folder / png_file.name
-                    shutil.move(str(png_file), str(destination))
-                    archived_count += 1
-                    self.logger.log_file_operation(f"Archived PNG: {png_file.name} -> {destination}")
-                    
-                except Exception as e:
-                    self.logger.log_error(f"Failed to archive PNG file: {png_file}", e)
-                    continue
+            if archived_count:
+                self._record_last_processed(folder_name, current_date)
+                expiry_entries.extend(archived)
             
             self.logger.log_file_operation(
-                f"PNG archiving completed for {folder_name}: {archived_count}/{len(png_files)} files archived"
+                f"PNG archiving completed for {folder_name}: {archived_count}/{len(png_files)} files archived to {batch_folder}"
             )
             
             return archived_count == len(png_files)
@@ -87,34 +262,68 @@ class FileManager:
             self.logger.log_error(f"Failed to archive PNGs for folder: {folder_name}", e)
             return False
     
+    def _list_pngs(self, folder_path: Path) -> List[os.DirEntry]:
+        """List PNG entries in a folder with a single directory scan."""
+        return scan_png_files(folder_path, self.config.processing_config.png_file_extensions)
+    
+    def _archive_png(self, png_file: os.DirEntry, batch_folder: str) -> Optional[Tuple[float, str]]:
+        """Move a single PNG into its archive batch folder.
+        
+        Returns (mtime, archived path) for the expiry log, or None on failure.
+        """
+        try:
+            # A move keeps the file's mtime, so read it from the source entry
+            mtime = png_file.stat().st_mtime
+            destination = os.path.join(batch_folder, png_file.name)
+            _move_file(png_file.path, destination)
+            # Per-file detail only at debug level; the batch summary is logged by the caller
+            self.logger.log_file_operation("Archived PNG: %s -> %s", png_file.name, destination, level='debug')
+            return mtime, destination
+            
+        except Exception as e:
+            self.logger.log_error(f"Failed to archive PNG file: {png_file.path}", e)
+            return None
+    
     def archive_sent_pdf(self, pdf_path: Path) -> bool:
         """Archive PDF file after successful email sending."""
+        if not self.config.processing_config.archive_after_processing:
+            return True
+        
+        expiry_entries: List[Tuple[float, str]] = []
+        archived = self._archive_pdf(pdf_path, datetime.datetime.now(), expiry_entries)
+        self._append_expiry_log(expiry_entries)
+        return archived
+    
+    def _archive_pdf(self, pdf_path: Path, current_date: datetime.datetime,
+                     expiry_entries: List[Tuple[float, str]]) -> bool:
+        """Move a sent PDF and its metadata into the dated archive, adding them to expiry_entries."""
         try:
-            if not self.config.processing_config.archive_after_processing:
-                return True
-            
             if not pdf_path.exists():
                 self.logger.log_error(f"PDF file does not exist: {pdf_path}")
                 return False
             
             # Create archive directory structure (Year/Month)
-            current_date = datetime.datetime.now()
-            archive_folder = self.pdf_archive_dir / str(current_date.year) / f"{current_date.month:02d}"
-            ensure_directory_exists(archive_folder)
+            archive_folder = self._pdf_archive_dir / str(current_date.year) / f"{current_date.month:02d}"
+            self._ensure_archive_dir(archive_folder)
             
             # Create archived filename with completion timestamp
-            timestamp = get_current_timestamp(self.config.processing_config.timestamp_format)
+            timestamp = current_date.strftime(self.config.processing_config.timestamp_format)
             archived_name = f"{pdf_path.stem}_sent_{timestamp}{pdf_path.suffix}"
             destination = archive_folder / archived_name
             
-            # Move PDF to archive
-            shutil.move(str(pdf_path), str(destination))
-            
-            # Also move metadata file if it exists
+            # Move PDF and its metadata file (if it exists) to the archive together
+            moves = [(pdf_path, destination)]
             metadata_path = pdf_path.with_suffix('.json')
+            metadata_destination = destination.with_suffix('.json')
             if metadata_path.exists():
-                metadata_destination = destination.with_suffix('.json')
-                shutil.move(str(metadata_path), str(metadata_destination))
+                moves.append((metadata_path, metadata_destination))
+            
+            _archive_files(moves)
+            expiry_entries.extend(
+                (os.stat(archived_path).st_mtime, str(archived_path)) for _, archived_path in moves
+            )
+            
+            if len(moves) > 1:
                 self.logger.log_file_operation(f"Archived PDF metadata: {metadata_destination}")
             
             self.logger.log_file_operation(f"Archived sent PDF: {pdf_path.name} -> {destination}")
@@ -124,6 +333,13 @@ class FileManager:
             self.logger.log_error(f"Failed to archive PDF: {pdf_path}", e)
             return False
     
+    def _ensure_archive_dir(self, directory: Union[str, Path]):
+        """Create an archive directory (and parents) unless it is already known to exist."""
+        directory = os.fspath(directory)
+        if directory not in self._mkdir_cache:
+            os.makedirs(directory, exist_ok=True)
+            self._mkdir_cache.add(directory)
+    
     def cleanup_old_archives(self) -> Dict[str, int]:
         """Clean up old archived files based on retention policy."""
         try:
@@ -136,16 +352,26 @@ class FileManager:
                 'directories_cleaned': 0
             }
             
+            if self.expiry_log_seeded_path.exists() and self.expiry_log_path.exists():
+                # Expire files straight from the archive log, without walking the tree,
+                # and only revisit the directories that lost files
+                png_cleaned, pdf_cleaned, touched_dirs = self._cleanup_from_expiry_log(cutoff_date.timestamp())
+                empty_dirs_cleaned = self._remove_empty_parents(touched_dirs)
+            else:
+                # Log missing or not yet known to be complete: walk the archives once,
+                # then seed the log from what remains
+                png_cleaned = self._cleanup_directory(self._png_archive_dir, cutoff_date)
+                pdf_cleaned = self._cleanup_directory(self._pdf_archive_dir, cutoff_date)
+                self._rebuild_expiry_log()
+                empty_dirs_cleaned = self._cleanup_empty_directories(self.archive_dir)
+            
             # Clean PNG archives
-            png_cleaned = self._cleanup_directory(self.png_archive_dir, cutoff_date)
             cleanup_results['png_files_cleaned'] = png_cleaned
             
             # Clean PDF archives
-            pdf_cleaned = self._cleanup_directory(self.pdf_archive_dir, cutoff_date)
             cleanup_results['pdf_files_cleaned'] = pdf_cleaned
             
             # Clean empty directories
-            empty_dirs_cleaned = self._cleanup_empty_directories(self.archive_dir)
             cleanup_results['directories_cleaned'] = empty_dirs_cleaned
             
             total_cleaned = sum(cleanup_results.values())
@@ -162,6 +388,128 @@ class FileManager:
             self.logger.log_error("Failed to cleanup old archives", e)
             return {'png_files_cleaned': 0, 'pdf_files_cleaned': 0, 'directories_cleaned': 0}
     
+    def _append_expiry_log(self, entries: Iterable[Tuple[float, str]]):
+        """Append archived files to the expiry log used by cleanup_old_archives."""
+        try:
+            archive_dir = str(self.archive_dir)
+            lines = ''.join(f"{mtime}\t{os.path.relpath(path, archive_dir)}\n" for mtime, path in entries)
+            if lines:
+                with self._bookkeeping_lock, open(self.expiry_log_path, 'a', encoding='utf-8') as f:
+                    f.write(lines)
+        except Exception as e:
+            self.logger.log_error(f"Failed to update archive expiry log: {self.expiry_log_path}", e)
+    
+    def _write_expiry_log(self, entries: List[Tuple[float, str]]):
+        """Atomically replace the expiry log with the given entries (paths relative to the archive directory)."""
+        temp_path = self.expiry_log_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.writelines(f"{mtime}\t{path}\n" for mtime, path in entries)
+        os.replace(temp_path, self.expiry_log_path)
+    
+    def _rebuild_expiry_log(self):
+        """Seed the expiry log from every file currently in the PNG and PDF archives.
+        
+        Writes the seeded marker once the log is complete; the scan holds the
+        bookkeeping lock so files archived meanwhile are not dropped by the replace.
+        """
+        if not self.archive_dir.exists():
+            # Nothing archived yet; the next cleanup after the first archive seeds the log
+            return
+        
+        try:
+            with self._bookkeeping_lock:
+                entries = []
+                archive_dir = str(self.archive_dir)
+                for directory in (self._png_archive_dir, self._pdf_archive_dir):
+                    for entry in _scandir_recursive(directory):
+                        if entry.is_file(follow_symlinks=False):
+                            try:
+                                entries.append((entry.stat().st_mtime, os.path.relpath(entry.path, archive_dir)))
+                            except FileNotFoundError:
+                                continue
+                self._write_expiry_log(entries)
+                self.expiry_log_seeded_path.touch()
+        except Exception as e:
+            self.logger.log_error(f"Failed to build archive expiry log: {self.expiry_log_path}", e)
+    
+    def _cleanup_from_expiry_log(self, cutoff_ts: float) -> Tuple[int, int, Set[str]]:
+        """Delete logged archive files older than cutoff_ts.
+        
+        Returns (png_count, pdf_count, directories that lost files).
+        """
+        png_cleaned = 0
+        pdf_cleaned = 0
+        touched_dirs: Set[str] = set()
+        
+        try:
+            expired = []
+            survivors = []
+            with open(self.expiry_log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    mtime, _, path = line.rstrip('\n').partition('\t')
+                    try:
+                        entry = (float(mtime), path)
+                    except ValueError:
+                        # Skip a torn or malformed line
+                        continue
+                    (expired if entry[0] < cutoff_ts else survivors).append(entry)
+            
+            archive_dir = str(self.archive_dir)
+            png_prefix = os.path.join(self.png_archive_dir_s, '')
+            removed = set()
+            for path in self._unlink_throttled(os.path.join(archive_dir, path) for _, path in expired):
+                removed.add(path)
+                if path.startswith(png_prefix):
+                    png_cleaned += 1
+                else:
+                    pdf_cleaned += 1
+                touched_dirs.add(os.path.dirname(path))
+                self.logger.log_file_operation("Cleaned up old file: %s", path, level='debug')
+            
+            if expired:
+                # Drop an entry only once its file is really gone; one that could not be
+                # deleted stays logged for the next cleanup
+                survivors.extend(
+                    entry for entry in expired
+                    if os.path.join(archive_dir, entry[1]) not in removed
+                    and os.path.lexists(os.path.join(archive_dir, entry[1]))
+                )
+                self._write_expiry_log(survivors)
+            
+        except Exception as e:
+            self.logger.log_error(f"Error during archive cleanup from expiry log: {self.expiry_log_path}", e)
+        
+        return png_cleaned, pdf_cleaned, touched_dirs
+    
+    def _unlink_throttled(self, paths: Iterable[str]) -> Iterator[str]:
+        """Delete files, yielding each removed path.
+        
+        With general.cleanup_delete_qps set, deletes run in batches of
+        qps * interval with a pause between batches, so a large cleanup does not
+        saturate the disk while archiving is in progress.
+        """
+        qps = getattr(self.config.general_config, 'cleanup_delete_qps', 0) or 0
+        batch_size = max(1, qps * CLEANUP_BATCH_INTERVAL_MS // 1000) if qps > 0 else 0
+        in_batch = 0
+        
+        for path in paths:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                # Already removed
+                continue
+            except OSError as e:
+                # In use or not permitted; leave it for a later cleanup
+                self.logger.log_error(f"Failed to delete old file: {path}", e)
+                continue
+            yield path
+            
+            if batch_size:
+                in_batch += 1
+                if in_batch >= batch_size:
+                    time.sleep(CLEANUP_BATCH_INTERVAL_MS / 1000)
+                    in_batch = 0
+    
     def _cleanup_directory(self, directory: Path, cutoff_date: datetime.datetime) -> int:
         """Clean up files in a directory older than cutoff date."""
         cleaned_count = 0
@@ -170,13 +518,23 @@ class FileManager:
             return cleaned_count
         
         try:
-            for file_path in directory.rglob('*'):
-                if file_path.is_file():
-                    file_date = datetime.datetime.fromtimestamp(file_path.stat().st_mtime)
-                    if file_date < cutoff_date:
-                        file_path.unlink()
-                        cleaned_count += 1
-                        self.logger.log_file_operation(f"Cleaned up old file: {file_path}")
+            # Compare raw mtimes against a float cutoff instead of building a datetime per file
+            cutoff_ts = cutoff_date.timestamp()
+            
+            expired = []
+            for entry in _scandir_recursive(directory):
+                if entry.is_file(follow_symlinks=False):
+                    try:
+                        file_mtime = entry.stat().st_mtime
+                    except FileNotFoundError:
+                        # File removed while scanning
+                        continue
+                    if file_mtime < cutoff_ts:
+                        expired.append(entry.path)
+            
+            for path in self._unlink_throttled(expired):
+                cleaned_count += 1
+                self.logger.log_file_operation("Cleaned up old file: %s", path, level='debug')
             
         except Exception as e:
             self.logger.log_error(f"Error during directory cleanup: {directory}", e)
@@ -187,27 +545,56 @@ class FileManager:
         """Remove empty directories recursively."""
         cleaned_count = 0
         
-        if not root_directory.exists():
-            return cleaned_count
-        
         try:
-            # Walk directories from deepest to shallowest
-            for directory in sorted(root_directory.rglob('*'), key=lambda p: len(p.parts), reverse=True):
-                if directory.is_dir() and directory != root_directory:
-                    try:
-                        # Try to remove if empty
-                        directory.rmdir()
-                        cleaned_count += 1
-                        self.logger.log_file_operation(f"Removed empty directory: {directory}")
-                    except OSError:
-                        # Directory not empty, skip
-                        pass
+            # Bottom-up walk visits directories from deepest to shallowest without sorting;
+            # a missing root simply yields nothing, so no separate exists() check is needed
+            root = str(root_directory)
+            kept_dirs = set()
+            for directory, dirnames, filenames in os.walk(root, topdown=False):
+                # Skip directories still holding files or a surviving subdirectory
+                if (directory == root or filenames
+                        or any(os.path.join(directory, name) in kept_dirs for name in dirnames)):
+                    kept_dirs.add(directory)
+                    continue
+                try:
+                    # Try to remove if empty
+                    os.rmdir(directory)
+                    cleaned_count += 1
+                    # Removed directories may be cached as existing
+                    self._mkdir_cache.clear()
+                    self.logger.log_file_operation("Removed empty directory: %s", directory, level='debug')
+                except OSError:
+                    # Directory not empty (e.g. only symlinks), skip
+                    kept_dirs.add(directory)
             
         except Exception as e:
             self.logger.log_error(f"Error during empty directory cleanup: {root_directory}", e)
         
         return cleaned_count
     
+    def _remove_empty_parents(self, directories: Iterable[str]) -> int:
+        """Remove the given directories and their ancestors while empty, stopping at the archive roots."""
+        cleaned_count = 0
+        roots = {str(self.archive_dir), str(self._png_archive_dir), str(self._pdf_archive_dir)}
+        visited = set()
+        
+        # Deepest first, so a batch folder goes before its month and year folders
+        for directory in sorted(directories, key=lambda d: d.count(os.sep), reverse=True):
+            while directory not in roots and directory not in visited:
+                visited.add(directory)
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    # Still holds files (or already gone); its parents stay too
+                    break
+                cleaned_count += 1
+                # Removed directories may be cached as existing
+                self._mkdir_cache.clear()
+                self.logger.log_file_operation("Removed empty directory: %s", directory, level='debug')
+                directory = os.path.dirname(directory)
+        
+        return cleaned_count
+    
     def get_folder_processing_status(self) -> Dict[str, Dict]:
         """Get processing status for all configured folders."""
         status = {}
@@ -216,18 +603,17 @@ class FileManager:
             folder_names = self.config.get_all_folder_names()
             folder_names = [name for name in folder_names if name != 'ALL']
             
+            # One listing of the output directory shared by every folder
+            pdf_cache = self._scan_output_pdfs()
+            
             for folder_name in folder_names:
                 folder_path = self.input_dir / folder_name
                 
                 # Count PNG files
-                png_count = 0
-                if folder_path.exists():
-                    png_extensions = self.config.processing_config.png_file_extensions
-                    for ext in png_extensions:
-                        png_count += len(list(folder_path.glob(f'*{ext}')))
+                png_count = len(self._list_pngs(folder_path))
                 
                 # Check for recent PDFs in output
-                recent_pdfs = self._get_recent_pdfs_for_folder(folder_name)
+                recent_pdfs = self._get_recent_pdfs_for_folder(folder_name, pdf_cache=pdf_cache)
                 
                 status[folder_name] = {
                     'folder_exists': folder_path.exists(),
@@ -242,8 +628,21 @@ class FileManager:
         
         return status
     
-    def _get_recent_pdfs_for_folder(self, folder_name: str, hours: int = 24) -> List[Path]:
-        """Get recent PDFs generated for a specific folder."""
+    def _scan_output_pdfs(self) -> List[Tuple[str, float, str]]:
+        """List (lowercased name, mtime, path) for every PDF in the output directory."""
+        pdfs = []
+        try:
+            with os.scandir(self.output_dir) as it:
+                for entry in it:
+                    if entry.name.endswith('.pdf') and entry.is_file():
+                        pdfs.append((entry.name.lower(), entry.stat().st_mtime, entry.path))
+        except FileNotFoundError:
+            pass
+        return pdfs
+    
+    def _get_recent_pdfs_for_folder(self, folder_name: str, hours: int = 24,
+                                    pdf_cache: Optional[List[Tuple[str, float, str]]] = None) -> List[Path]:
+        """Get recent PDFs generated for a specific folder, optionally from a prebuilt listing."""
         recent_pdfs = []
         
         try:
@@ -251,42 +650,86 @@ class FileManager:
             if not pdf_name:
                 return recent_pdfs
             
-            cutoff_time = datetime.datetime.now() - datetime.timedelta(hours=hours)
+            cutoff_ts = (datetime.datetime.now() - datetime.timedelta(hours=hours)).timestamp()
+            pdf_name_lower = pdf_name.lower()
+            
+            if pdf_cache is None:
+                pdf_cache = self._scan_output_pdfs()
             
             # Check output directory
-            for pdf_file in self.output_dir.glob('*.pdf'):
-                if pdf_name.lower() in pdf_file.name.lower():
-                    file_time = datetime.datetime.fromtimestamp(pdf_file.stat().st_mtime)
-                    if file_time > cutoff_time:
-                        recent_pdfs.append(pdf_file)
+            for name_lower, mtime, path in pdf_cache:
+                if pdf_name_lower in name_lower and mtime > cutoff_ts:
+                    recent_pdfs.append(Path(path))
             
         except Exception as e:
             self.logger.log_error(f"Failed to get recent PDFs for folder: {folder_name}", e)
         
         return recent_pdfs
     
+    def _load_last_processed_index(self) -> Dict[str, str]:
+        """Load the folder -> last processing time index (empty if missing or unreadable)."""
+        if self._last_processed_index is None:
+            try:
+                with open(self.last_processed_index_path, 'r', encoding='utf-8') as f:
+                    self._last_processed_index = json.load(f)
+            except FileNotFoundError:
+                self._last_processed_index = {}
+            except (OSError, ValueError) as e:
+                self.logger.log_error(f"Failed to read archive index: {self.last_processed_index_path}", e)
+                self._last_processed_index = {}
+        return self._last_processed_index
+    
+    def _record_last_processed(self, folder_name: str, processed_at: datetime.datetime):
+        """Record a folder's processing time in the archive index (atomic replace)."""
+        try:
+            with self._bookkeeping_lock:
+                index = self._load_last_processed_index()
+                index[folder_name] = processed_at.isoformat(timespec='seconds')
+                
+                temp_path = self.last_processed_index_path.with_suffix('.tmp')
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(index, f, indent=2)
+                os.replace(temp_path, self.last_processed_index_path)
+            
+        except Exception as e:
+            self.logger.log_error(f"Failed to update archive index for folder: {folder_name}", e)
+    
     def _get_last_processing_time(self, folder_name: str) -> Optional[str]:
         """Get the last processing time for a folder from archives."""
         try:
-            # Check PNG archives for most recent processing
-            latest_time = None
-            
-            for year_dir in self.png_archive_dir.iterdir():
-                if not year_dir.is_dir():
-                    continue
-                
-                for month_dir in year_dir.iterdir():
-                    if not month_dir.is_dir():
+            # Fast path: archive index written by archive_processed_pngs
+            indexed_time = self._load_last_processed_index().get(folder_name)
+            if indexed_time:
+                return datetime.datetime.fromisoformat(indexed_time).strftime('%Y-%m-%d %H:%M:%S')
+            
+            # Check PNG archives (Year/Month/batch) for most recent processing;
+            # only matching batch folders are stat()ed
+            latest_ts = 0.0
+            
+            with os.scandir(self.png_archive_dir_s) as years:
+                for year_dir in years:
+                    if not year_dir.is_dir(follow_symlinks=False):
                         continue
                     
-                    for batch_dir in month_dir.iterdir():
-                        if batch_dir.is_dir() and batch_dir.name.startswith(folder_name):
-                            dir_time = datetime.datetime.fromtimestamp(batch_dir.stat().st_mtime)
-                            if latest_time is None or dir_time > latest_time:
-                                latest_time = dir_time
-            
-            return latest_time.strftime('%Y-%m-%d %H:%M:%S') if latest_time else None
+                    with os.scandir(year_dir.path) as months:
+                        for month_dir in months:
+                            if not month_dir.is_dir(follow_symlinks=False):
+                                continue
+                            
+                            with os.scandir(month_dir.path) as batches:
+                                for batch_dir in batches:
+                                    if batch_dir.name.startswith(folder_name) and batch_dir.is_dir(follow_symlinks=False):
+                                        dir_ts = batch_dir.stat().st_mtime
+                                        if dir_ts > latest_ts:
+                                            latest_ts = dir_ts
+            
+            if not latest_ts:
+                return None
+            return datetime.datetime.fromtimestamp(latest_ts).strftime('%Y-%m-%d %H:%M:%S')
             
+        except FileNotFoundError:
+            # Nothing archived yet
+            return None
         except Exception as e:
             self.logger.log_error(f"Failed to get last processing time for folder: {folder_name}", e)
             return None
@@ -306,7 +749,7 @@ class FileManager:
             # Copy all files
             for file_path in folder_path.iterdir():
                 if file_path.is_file():
-                    shutil.copy2(str(file_path), str(backup_dir / file_path.name))
+                    _fast_copy(file_path, backup_dir / file_path.name)
             
             self.logger.log_file_operation(f"Created processing backup: {backup_dir}")
             return backup_dir
@@ -315,10 +758,12 @@ class FileManager:
             self.logger.log_error(f"Failed to create backup for folder: {folder_name}", e)
             return None
     
-    def validate_file_permissions(self) -> Dict[str, bool]:
+    def validate_file_permissions(self) -> Dict[str, Dict[str, bool]]:
         """Validate file permissions for all required directories."""
-        permissions = {}
-        
+        return dict(self.iter_file_permissions())
+    
+    def iter_file_permissions(self) -> Iterator[Tuple[str, Dict[str, bool]]]:
+        """Yield (directory, permission flags) for each required directory as it is checked."""
         directories_to_check = [
             self.input_dir,
             self.output_dir,
@@ -329,29 +774,34 @@ class FileManager:
         
         for directory in directories_to_check:
             try:
-                # Test read permission
-                can_read = os.access(directory, os.R_OK)
+                # One stat decides existence; access checks only run for existing directories
+                try:
+                    os.stat(directory)
+                    exists = True
+                except FileNotFoundError:
+                    exists = False
                 
-                # Test write permission
-                can_write = os.access(directory, os.W_OK)
+                # Test read and write permission (os.access honours ACLs and effective ids)
+                can_read = exists and os.access(directory, os.R_OK)
+                can_write = exists and os.access(directory, os.W_OK)
                 
-                permissions[str(directory)] = {
-                    'exists': directory.exists(),
+                perms = {
+                    'exists': exists,
                     'readable': can_read,
                     'writable': can_write,
-                    'valid': directory.exists() and can_read and can_write
+                    'valid': exists and can_read and can_write
                 }
                 
             except Exception as e:
                 self.logger.log_error(f"Failed to check permissions for: {directory}", e)
-                permissions[str(directory)] = {
+                perms = {
                     'exists': False,
                     'readable': False,
                     'writable': False,
                     'valid': False
                 }
-        
-        return permissions
+            
+            yield str(directory), perms
     
     def get_disk_usage_info(self) -> Dict[str, Dict]:
         """Get disk usage information for key directories."""
@@ -366,8 +816,12 @@ class FileManager:
         for name, directory in directories:
             try:
                 if directory.exists():
-                    total_size = sum(f.stat().st_size for f in directory.rglob('*') if f.is_file())
-                    file_count = len([f for f in directory.rglob('*') if f.is_file()])
+                    # Single traversal accumulating integer byte totals and count
+                    total_size = 0
+                    file_count = 0
+                    for size in _iter_file_sizes(directory):
+                        total_size += size
+                        file_count += 1
                     
                     usage_info[name] = {
                         'total_size_mb': total_size / 1024 / 1024,
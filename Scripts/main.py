@@ -3,28 +3,56 @@ Main orchestration script for BIMailer automation system.
 Coordinates PDF generation, email sending, and file archiving with comprehensive error handling.
 """
 
+import queue
+import string
 import sys
+import threading
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import datetime
 
-# Import all BIMailer modules
-from utils import BIMailerLogger, ProcessingLock
+# Import BIMailer modules; pdf_generator and email_sender (Pillow/reportlab/smtplib)
+# are imported in _init_full() so diagnostics never load them
+from utils import get_logger, ProcessingLock, shutdown_logging
 from config_manager import ConfigManager
-from pdf_generator import PDFGenerator
-from email_sender import EmailSender
 from file_manager import FileManager
 
 
+# Folders buffered between pipeline stages (bounds PDFs waiting to be sent or archived)
+PIPELINE_QUEUE_SIZE = 2
+
+# Defaults for skipping the rest of a run when email keeps failing (SMTP outage)
+OUTAGE_ABORT_MIN_FOLDERS = 30
+OUTAGE_ABORT_PERCENT = 33
+
+# Body of admin error notifications, parsed once
+ERROR_NOTIFICATION_TEMPLATE = string.Template("""BIMailer Error Notification
+
+Error occurred at: $timestamp
+
+Error Details:
+$details
+
+Please check the system logs for more information.
+
+System: BIMailer Automation
+""")
+
+
 class BIMailerOrchestrator:
     """Main orchestrator for the BIMailer automation system."""
     
-    def __init__(self):
-        """Initialize the orchestrator with all required components."""
+    def __init__(self, diagnostics_only: bool = False):
+        """Initialize the orchestrator with all required components.
+        
+        With diagnostics_only, only configuration and the file manager are set up.
+        """
         try:
             # Initialize logger first
-            self.logger = BIMailerLogger()
+            self.logger = get_logger()
             self.logger.log_summary("BIMailer system starting up")
             
             # Load configuration
@@ -37,11 +65,33 @@ class BIMailerOrchestrator:
                 self.logger.log_error(error_msg)
                 raise RuntimeError(error_msg)
             
+            # Settings are read-only for the orchestrator's lifetime; bind them once
+            self._admin_cfg = self.config.admin_config
+            self._gen_cfg = self.config.general_config
+            self._email_cfg = self.config.email_config
+            self._lock_timeout = self._gen_cfg.processing_lock_timeout_minutes
+            
+            # Configured folder names for O(1) lookups in process_specific_folder
+            self._folder_names_set = frozenset(self.config.get_all_folder_names())
+            
+            # Folder -> (start datetime, monotonic start ns); end times are derived from these
+            self._folder_clocks: Dict[str, Tuple[datetime.datetime, int]] = {}
+            
+            # Email outcomes in the current run, used to stop early during an SMTP outage
+            self._outage_lock = threading.Lock()
+            self._reset_outage_tracking()
+            
+            # Admin emails (subject, body, is_error) held until the end of the workflow
+            self._pending_admin_mail: List[Tuple[str, str, bool]] = []
+            
             # Initialize components
-            self.pdf_generator = PDFGenerator(self.config)
-            self.email_sender = EmailSender(self.config)
+            self.pdf_generator = None
+            self.email_sender = None
             self.file_manager = FileManager(self.config)
             
+            if not diagnostics_only:
+                self._init_full()
+            
             self.logger.log_summary("BIMailer system initialized successfully")
             
         except Exception as e:
@@ -51,10 +101,19 @@ class BIMailerOrchestrator:
                 print(f"Critical error during initialization: {e}")
             raise
     
+    def _init_full(self):
+        """Import and create the PDF and email components needed for processing."""
+        from pdf_generator import PDFGenerator
+        from email_sender import EmailSender
+        
+        self.pdf_generator = PDFGenerator(self.config)
+        self.email_sender = EmailSender(self.config)
+    
     def run_full_processing(self) -> Dict[str, Dict]:
         """Run the complete processing workflow for all folders."""
         processing_results = {}
         start_time = datetime.datetime.now()
+        start_ns = time.monotonic_ns()
         
         try:
             self.logger.log_summary("Starting full processing workflow")
@@ -68,19 +127,19 @@ class BIMailerOrchestrator:
             
             self.logger.log_summary(f"Found {len(folders_to_process)} folders to process: {folders_to_process}")
             
-            # Process each folder
-            for folder_name in folders_to_process:
-                folder_result = self._process_single_folder(folder_name)
-                processing_results[folder_name] = folder_result
-            
-            # Generate and send admin summary
-            self._send_admin_summary(processing_results, start_time)
+            # One SMTP login serves every folder and the admin summary
+            with self.email_sender.open_session():
+                # Process each folder
+                processing_results = self._process_folders(folders_to_process)
+                
+                # Generate and send admin summary
+                self._send_admin_summary(processing_results, start_time)
+                self._flush_admin_mail()
             
             # Cleanup old files
             self._perform_cleanup()
             
-            end_time = datetime.datetime.now()
-            duration = (end_time - start_time).total_seconds()
+            duration = (time.monotonic_ns() - start_ns) / 1e9
             
             self.logger.log_summary(f"Full processing completed in {duration:.2f} seconds")
             
@@ -89,131 +148,326 @@ class BIMailerOrchestrator:
         except Exception as e:
             self.logger.log_error("Critical error during full processing", e)
             self._send_error_notification("Critical Processing Error", str(e))
+            self._flush_admin_mail()
             raise
     
+    def _get_folder_workers(self, folder_count: int) -> int:
+        """Number of folders to process in parallel."""
+        if self._email_cfg.use_default_mailer:
+            # Default mailer drives interactive clients (Outlook COM) that must stay on one thread
+            return 1
+        workers = max(1, getattr(self._gen_cfg, 'folder_workers', 1) or 1)
+        return min(workers, folder_count)
+    
+    def _process_folders(self, folders_to_process: List[str]) -> Dict[str, Dict]:
+        """Run every folder through the workflow, overlapping folders when configured."""
+        self._reset_outage_tracking()
+        
+        workers = self._get_folder_workers(len(folders_to_process))
+        if workers <= 1:
+            if self._use_folder_pipeline(len(folders_to_process)):
+                return self._process_folders_pipelined(folders_to_process)
+            return {name: self._process_folder_unless_outage(name) for name in folders_to_process}
+        
+        self.logger.log_summary(f"Processing {len(folders_to_process)} folders with {workers} workers")
+        
+        # Each folder's PDF renders in a worker process once its own outage check has passed
+        results = {}
+        with self.pdf_generator.process_pool(workers), ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self._process_folder_unless_outage, name): name for name in folders_to_process}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        
+        # Keep the report in folder order regardless of completion order
+        return {name: results[name] for name in folders_to_process}
+    
+    def _use_folder_pipeline(self, folder_count: int) -> bool:
+        """Whether to overlap the generate, send and archive stages across folders."""
+        if folder_count < 2 or self._email_cfg.use_default_mailer:
+            return False
+        return bool(getattr(self._gen_cfg, 'pipeline_folders', False))
+    
+    def _process_folders_pipelined(self, folders_to_process: List[str]) -> Dict[str, Dict]:
+        """Process folders as a generate -> send -> archive pipeline.
+        
+        PDFs are generated on the calling thread while one thread sends and
+        another archives, so folder K+1 renders while folder K is mailed and
+        folder K-1 is archived. Each stage still handles folders in order.
+        """
+        self.logger.log_summary(f"Processing {len(folders_to_process)} folders as a pipeline")
+        
+        results = {name: self._new_folder_result(name) for name in folders_to_process}
+        
+        # Bounded so generation cannot run far ahead of sending
+        send_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        archive_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        
+        def send_worker():
+            while True:
+                item = send_queue.get()
+                if item is None:
+                    break
+                result, pdf_path, pdf_metadata = item
+                if self._run_stage(result, self._send_stage, pdf_path, pdf_metadata):
+                    archive_queue.put((result, pdf_path))
+            archive_queue.put(None)
+        
+        def archive_worker():
+            while True:
+                item = archive_queue.get()
+                if item is None:
+                    break
+                result, pdf_path = item
+                if self._run_stage(result, self._archive_stage, pdf_path):
+                    self._finish_folder(result)
+        
+        workers = [
+            threading.Thread(target=send_worker, name="bimailer-send", daemon=True),
+            threading.Thread(target=archive_worker, name="bimailer-archive", daemon=True)
+        ]
+        for worker in workers:
+            worker.start()
+        
+        try:
+            for name in folders_to_process:
+                if self._email_outage_detected():
+                    results[name] = self._outage_skip_result(name)
+                    continue
+                result = results[name]
+                generated = self._run_stage(result, self._generate_stage)
+                if generated:
+                    send_queue.put((result, *generated))
+        finally:
+            send_queue.put(None)
+            for worker in workers:
+                worker.join()
+        
+        return results
+    
+    def _reset_outage_tracking(self):
+        """Clear the email attempt/failure counters for a new run."""
+        with self._outage_lock:
+            self._email_attempts = 0
+            self._email_failures = 0
+            self._outage_logged = False
+    
+    def _email_outage_detected(self) -> bool:
+        """True once enough folders have failed to email that the server looks down.
+        
+        Trips when at least general.outage_abort_min_folders folders have been
+        emailed and general.outage_abort_percent of them failed.
+        """
+        general = self._gen_cfg
+        min_folders = getattr(general, 'outage_abort_min_folders', OUTAGE_ABORT_MIN_FOLDERS)
+        percent = getattr(general, 'outage_abort_percent', OUTAGE_ABORT_PERCENT)
+        if percent <= 0:
+            return False
+        
+        with self._outage_lock:
+            attempts, failures = self._email_attempts, self._email_failures
+            if attempts < max(1, min_folders) or failures * 100 < attempts * percent:
+                return False
+            if not self._outage_logged:
+                self._outage_logged = True
+                self.logger.log_error(
+                    f"Email failing for {failures}/{attempts} folders; "
+                    f"skipping remaining folders until the next run"
+                )
+        return True
+    
+    def _outage_skip_result(self, folder_name: str) -> Dict:
+        """Result for a folder left unprocessed because of an email outage."""
+        result = self._new_folder_result(folder_name)
+        result['error'] = "Skipped due to email outage"
+        result['skipped_due_to_outage'] = True
+        self.logger.log_file_operation(f"Skipping folder {folder_name} due to email outage; PNGs left for next run")
+        return result
+    
+    def _process_folder_unless_outage(self, folder_name: str) -> Dict:
+        """Process a folder, or skip it if an email outage has been detected."""
+        if self._email_outage_detected():
+            return self._outage_skip_result(folder_name)
+        return self._process_single_folder(folder_name)
+    
     def _process_single_folder(self, folder_name: str) -> Dict:
         """Process a single folder through the complete workflow."""
-        result = {
+        result = self._new_folder_result(folder_name)
+        
+        generated = self._run_stage(result, self._generate_stage)
+        if generated and self._run_stage(result, self._send_stage, *generated):
+            if self._run_stage(result, self._archive_stage, generated[0]):
+                self._finish_folder(result)
+        
+        return result
+    
+    def _new_folder_result(self, folder_name: str) -> Dict:
+        """Create the result record for a folder."""
+        started = datetime.datetime.now()
+        self._folder_clocks[folder_name] = (started, time.monotonic_ns())
+        return {
             'folder_name': folder_name,
             'pdf_created': False,
             'emails_sent': False,
             'files_archived': False,
             'error': None,
             'pdf_path': None,
-            'start_time': datetime.datetime.now().isoformat()
+            'start_time': started.isoformat()
         }
+    
+    def _stamp_end_time(self, result: Dict):
+        """Set a folder's end_time from its start time plus monotonic elapsed time."""
+        started, start_ns = self._folder_clocks[result['folder_name']]
+        elapsed_us = (time.monotonic_ns() - start_ns) // 1000
+        result['end_time'] = (started + datetime.timedelta(microseconds=elapsed_us)).isoformat()
+    
+    def _run_stage(self, result: Dict, stage, *args):
+        """Run one workflow stage, recording any exception on the folder's result.
         
+        Returns the stage's return value, or None if it raised.
+        """
         try:
-            self.logger.log_summary(f"Processing folder: {folder_name}")
-            
-            # Step 1: Generate PDF
-            pdf_path = self.pdf_generator.generate_pdf_for_folder(folder_name)
-            
-            if not pdf_path:
-                result['error'] = "PDF generation failed"
-                return result
-            
-            result['pdf_created'] = True
-            result['pdf_path'] = str(pdf_path)
-            
-            # Step 2: Validate PDF size
-            if not self.pdf_generator.validate_pdf_size(pdf_path):
-                result['error'] = "PDF size validation failed"
-                return result
-            
-            # Step 3: Get PDF metadata for email
-            pdf_metadata = self.pdf_generator.get_pdf_metadata(pdf_path)
-            if not pdf_metadata:
-                self.logger.log_error(f"Could not load PDF metadata for: {pdf_path}")
-                pdf_metadata = {'pdf_name': folder_name, 'files': []}
-            
-            # Step 4: Send emails
-            emails_success = self.email_sender.send_pdf_emails(pdf_path, pdf_metadata)
-            result['emails_sent'] = emails_success
-            
-            if not emails_success:
-                result['error'] = "Email sending failed"
-                # Don't return here - still try to archive
-            
-            # Step 5: Archive files (only if emails were sent successfully)
-            if emails_success:
-                # Archive the PDF
-                pdf_archived = self.file_manager.archive_sent_pdf(pdf_path)
-                
-                # Archive the PNG files
-                pngs_archived = self.file_manager.archive_processed_pngs(folder_name)
-                
-                result['files_archived'] = pdf_archived and pngs_archived
-                
-                if not result['files_archived']:
-                    result['error'] = "File archiving failed"
-            else:
-                self.logger.log_file_operation(f"Skipping archiving for {folder_name} due to email failures")
-            
-            # Log completion
-            if result['emails_sent'] and result['files_archived']:
-                self.logger.log_summary(f"Successfully completed processing for folder: {folder_name}")
-            else:
-                self.logger.log_error(f"Partial failure for folder {folder_name}: {result['error']}")
-            
-            result['end_time'] = datetime.datetime.now().isoformat()
-            return result
-            
+            return stage(result, *args)
         except Exception as e:
             result['error'] = f"Processing exception: {str(e)}"
-            result['end_time'] = datetime.datetime.now().isoformat()
-            self.logger.log_error(f"Failed to process folder: {folder_name}", e)
-            return result
+            self._stamp_end_time(result)
+            self.logger.log_error(f"Failed to process folder: {result['folder_name']}", e)
+            return None
+    
+    def _generate_stage(self, result: Dict) -> Optional[Tuple[Path, Dict]]:
+        """Generate and validate a folder's PDF; returns (pdf_path, metadata) or None."""
+        folder_name = result['folder_name']
+        self.logger.log_summary(f"Processing folder: {folder_name}")
+        
+        # Step 1: Generate PDF (metadata comes back from the generator; no sidecar re-read)
+        pdf_path, pdf_metadata = self.pdf_generator.generate_pdf_for_folder(folder_name, return_metadata=True)
+        
+        if not pdf_path:
+            result['error'] = "PDF generation failed"
+            return None
+        
+        result['pdf_created'] = True
+        result['pdf_path'] = str(pdf_path)
+        
+        # Step 2: Validate PDF size
+        if not self.pdf_generator.validate_pdf_size(pdf_path):
+            result['error'] = "PDF size validation failed"
+            return None
+        
+        # Step 3: PDF metadata for email
+        if not pdf_metadata:
+            self.logger.log_error(f"Could not load PDF metadata for: {pdf_path}")
+            pdf_metadata = {'pdf_name': folder_name, 'files': []}
+        
+        return pdf_path, pdf_metadata
+    
+    def _send_stage(self, result: Dict, pdf_path: Path, pdf_metadata: Dict) -> bool:
+        """Email a folder's PDF; returns True once the stage has run."""
+        # Step 4: Send emails
+        emails_success = self.email_sender.send_pdf_emails(pdf_path, pdf_metadata)
+        result['emails_sent'] = emails_success
+        
+        with self._outage_lock:
+            self._email_attempts += 1
+            if not emails_success:
+                self._email_failures += 1
+        
+        if not emails_success:
+            result['error'] = "Email sending failed"
+            # Don't stop here - the archive stage still logs the skip
+        
+        return True
+    
+    def _archive_stage(self, result: Dict, pdf_path: Path) -> bool:
+        """Archive a folder's PDF and PNGs if its emails went out; returns True once the stage has run."""
+        folder_name = result['folder_name']
+        
+        # Step 5: Archive files (only if emails were sent successfully)
+        if result['emails_sent']:
+            # Archive the PDF and the PNG files together
+            result['files_archived'] = self.file_manager.archive_folder(folder_name, pdf_path)
+            
+            if not result['files_archived']:
+                result['error'] = "File archiving failed"
+        else:
+            self.logger.log_file_operation(f"Skipping archiving for {folder_name} due to email failures")
+        
+        return True
+    
+    def _finish_folder(self, result: Dict):
+        """Log a folder's outcome and stamp its end time."""
+        folder_name = result['folder_name']
+        if result['emails_sent'] and result['files_archived']:
+            self.logger.log_summary(f"Successfully completed processing for folder: {folder_name}")
+        else:
+            self.logger.log_error(f"Partial failure for folder {folder_name}: {result['error']}")
+        
+        self._stamp_end_time(result)
     
     def _send_admin_summary(self, results: Dict[str, Dict], start_time: datetime.datetime):
         """Send processing summary to administrators."""
         try:
-            if not self.config.admin_config.send_summary_email:
+            if not self._admin_cfg.send_summary_email:
                 return
             
-            summary_body = self.email_sender.generate_processing_summary(results)
-            subject = f"BIMailer Processing Summary - {datetime.datetime.now().strftime('%Y-%m-%d')}"
-            
-            success = self.email_sender.send_admin_notification(subject, summary_body, is_error=False)
+            # Only the fields the summary reports, not the full per-folder records
+            compact = [
+                (name, r.get('pdf_created'), r.get('emails_sent'), r.get('error'))
+                for name, r in results.items()
+            ]
+            summary_body = self.email_sender.generate_processing_summary_compact(compact)
+            # Date the report by the run's start rather than reading the clock again
+            subject = f"BIMailer Processing Summary - {start_time.strftime('%Y-%m-%d')}"
             
-            if success:
-                self.logger.log_email_operation("Admin summary email sent successfully")
-            else:
-                self.logger.log_error("Failed to send admin summary email")
+            self._pending_admin_mail.append((subject, summary_body, False))
                 
         except Exception as e:
             self.logger.log_error("Failed to send admin summary", e)
     
     def _send_error_notification(self, subject: str, error_details: str):
-        """Send error notification to administrators."""
+        """Queue an error notification for administrators (sent by _flush_admin_mail)."""
         try:
-            if not self.config.admin_config.send_error_notifications:
+            if not self._admin_cfg.send_error_notifications:
                 return
             
-            timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            if any(is_error and queued == subject for queued, _, is_error in self._pending_admin_mail):
+                # Same error (subjects name the folder) already queued in this run
+                self.logger.log_email_operation(f"Duplicate error notification suppressed: {subject}")
+                return
             
-            error_body = f"""BIMailer Error Notification
-
-Error occurred at: {timestamp}
-
-Error Details:
-{error_details}
-
-Please check the system logs for more information.
-
-System: BIMailer Automation
-"""
+            timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
-            success = self.email_sender.send_admin_notification(subject, error_body, is_error=True)
+            error_body = ERROR_NOTIFICATION_TEMPLATE.substitute(timestamp=timestamp, details=error_details)
             
-            if success:
-                self.logger.log_email_operation("Error notification sent to administrators")
-            else:
-                self.logger.log_error("Failed to send error notification")
+            self._pending_admin_mail.append((subject, error_body, True))
                 
         except Exception as e:
             self.logger.log_error("Failed to send error notification", e)
     
+    def _flush_admin_mail(self):
+        """Send all queued admin emails over a single SMTP session."""
+        pending, self._pending_admin_mail = self._pending_admin_mail, []
+        if not pending:
+            return
+        
+        try:
+            with self.email_sender.open_session():
+                for subject, body, is_error in pending:
+                    success = self.email_sender.send_admin_notification(subject, body, is_error=is_error)
+                    
+                    if success:
+                        self.logger.log_email_operation(
+                            "Error notification sent to administrators" if is_error
+                            else "Admin summary email sent successfully"
+                        )
+                    else:
+                        self.logger.log_error(
+                            "Failed to send error notification" if is_error
+                            else "Failed to send admin summary email"
+                        )
+                        
+        except Exception as e:
+            self.logger.log_error("Failed to send admin emails", e)
+    
     def _perform_cleanup(self):
         """Perform system cleanup tasks."""
         try:
@@ -230,30 +484,50 @@ System: BIMailer Automation
         except Exception as e:
             self.logger.log_error("Failed to perform cleanup tasks", e)
     
-    def run_diagnostics(self) -> Dict:
-        """Run system diagnostics and return status information."""
+    def run_diagnostics(self, include_details: bool = True) -> Dict:
+        """Run system diagnostics and return status information.
+        
+        Without include_details, per-directory permission results are not collected;
+        only failures are reported, as critical issues.
+        """
         try:
             self.logger.log_summary("Running system diagnostics")
             
-            diagnostics = {
-                'timestamp': datetime.datetime.now().isoformat(),
-                'configuration': {
-                    'valid': True,
-                    'summary': self.config.get_configuration_summary()
-                },
-                'folders': self.file_manager.get_folder_processing_status(),
-                'permissions': self.file_manager.validate_file_permissions(),
-                'disk_usage': self.file_manager.get_disk_usage_info(),
-                'system_status': 'healthy'
-            }
+            # The three filesystem checks are independent and latency-bound; overlap them
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                folders_future = executor.submit(self.file_manager.get_folder_processing_status)
+                if include_details:
+                    permissions_future = executor.submit(self.file_manager.validate_file_permissions)
+                else:
+                    # Stream the checks, keeping only failures
+                    permissions_future = executor.submit(lambda: {
+                        path: perms for path, perms in self.file_manager.iter_file_permissions()
+                        if not perms['valid']
+                    })
+                disk_usage_future = executor.submit(self.file_manager.get_disk_usage_info)
+                
+                diagnostics = {
+                    'timestamp': datetime.datetime.now().isoformat(),
+                    'configuration': {
+                        'valid': True,
+                        'summary': self.config.get_configuration_summary()
+                    },
+                    'folders': folders_future.result(),
+                    'disk_usage': disk_usage_future.result(),
+                    'system_status': 'healthy'
+                }
+                permissions = permissions_future.result()
+                if include_details:
+                    diagnostics['permissions'] = permissions
             
             # Check for any critical issues
             critical_issues = []
             
             # Check folder permissions
-            for path, perms in diagnostics['permissions'].items():
-                if not perms.get('valid', False):
-                    critical_issues.append(f"Invalid permissions for: {path}")
+            critical_issues.extend(
+                f"Invalid permissions for: {path}"
+                for path, perms in permissions.items() if not perms.get('valid', False)
+            )
             
             # Check for folders with files but no processing capability
             for folder, status in diagnostics['folders'].items():
@@ -283,7 +557,7 @@ System: BIMailer Automation
             self.logger.log_summary(f"Processing specific folder: {folder_name}")
             
             # Validate folder exists in configuration
-            if folder_name not in self.config.get_all_folder_names():
+            if folder_name not in self._folder_names_set:
                 error_msg = f"Folder '{folder_name}' not found in configuration"
                 self.logger.log_error(error_msg)
                 return {'error': error_msg}
@@ -297,6 +571,7 @@ System: BIMailer Automation
                     f"BIMailer Processing Error - {folder_name}",
                     f"Error processing folder {folder_name}: {result['error']}"
                 )
+                self._flush_admin_mail()
             
             return result
             
@@ -314,8 +589,8 @@ def main():
             
             if command == 'diagnostics':
                 # Run diagnostics only
-                orchestrator = BIMailerOrchestrator()
-                diagnostics = orchestrator.run_diagnostics()
+                orchestrator = BIMailerOrchestrator(diagnostics_only=True)
+                diagnostics = orchestrator.run_diagnostics(include_details=False)
                 
                 print("=== BIMailer System Diagnostics ===")
                 print(f"Timestamp: {diagnostics['timestamp']}")
@@ -333,7 +608,7 @@ def main():
                 folder_name = command.split(':', 1)[1]
                 orchestrator = BIMailerOrchestrator()
                 
-                with ProcessingLock(timeout_minutes=orchestrator.config.general_config.processing_lock_timeout_minutes):
+                with ProcessingLock(timeout_minutes=orchestrator._lock_timeout):
                     result = orchestrator.process_specific_folder(folder_name)
                 
                 if result.get('error'):
@@ -351,11 +626,11 @@ def main():
         orchestrator = BIMailerOrchestrator()
         
         # Use processing lock to prevent concurrent runs
-        with ProcessingLock(timeout_minutes=orchestrator.config.general_config.processing_lock_timeout_minutes):
+        with ProcessingLock(timeout_minutes=orchestrator._lock_timeout):
             results = orchestrator.run_full_processing()
         
         # Print summary
-        successful_folders = len([r for r in results.values() if r.get('emails_sent')])
+        successful_folders = sum(1 for r in results.values() if r.get('emails_sent'))
         total_folders = len(results)
         
         print(f"BIMailer processing completed: {successful_folders}/{total_folders} folders processed successfully")
@@ -370,6 +645,10 @@ def main():
         print(f"Critical error in BIMailer: {e}")
         traceback.print_exc()
         return 1
+    
+    finally:
+        # Write out records still queued for the background log writer
+        shutdown_logging()
 
 
 if __name__ == "__main__":
@@ -3,18 +3,36 @@ Basic version of BIMailer main script that works without external dependencies.
 Use this for testing configuration and basic functionality before installing packages.
 """
 
+import importlib.util
 import sys
 import traceback
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 import datetime
 
 # Import BIMailer modules (only those that don't require external packages)
-from utils import BIMailerLogger, ProcessingLock
+from utils import get_logger, ProcessingLock
 from config_manager import ConfigManager
 from file_manager import FileManager
 
 
+# Distribution name -> importable top-level module for the full system's dependencies
+EXTERNAL_PACKAGES = {
+    'Pillow': 'PIL',
+    'reportlab': 'reportlab'
+}
+
+
+@lru_cache(maxsize=None)
+def _is_module_installed(module_name: str) -> bool:
+    """Check whether a module can be imported without actually importing it."""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
 class BIMailerBasicOrchestrator:
     """Basic orchestrator for testing without external dependencies."""
     
@@ -22,7 +40,7 @@ class BIMailerBasicOrchestrator:
         """Initialize the orchestrator with basic components."""
         try:
             # Initialize logger first
-            self.logger = BIMailerLogger()
+            self.logger = get_logger()
             self.logger.log_summary("BIMailer basic system starting up")
             
             # Load configuration
@@ -97,30 +115,12 @@ class BIMailerBasicOrchestrator:
     
     def _check_external_packages(self) -> Dict:
         """Check if external packages are installed."""
+        # Locate each package's module spec; importing them would load each package in full
         packages = {
-            'Pillow': False,
-            'reportlab': False,
-            'pandas': False
+            package: _is_module_installed(module_name)
+            for package, module_name in EXTERNAL_PACKAGES.items()
         }
         
-        # Check each package with more detailed error handling
-        for package in packages:
-            try:
-                if package == 'Pillow':
-                    import PIL
-                    packages[package] = True
-                elif package == 'reportlab':
-                    import reportlab
-                    packages[package] = True
-                elif package == 'pandas':
-                    import pandas
-                    packages[package] = True
-            except ImportError as e:
-                packages[package] = False
-            except Exception as e:
-                # Other errors might indicate partial installation
-                packages[package] = False
-        
         return {
             'packages': packages,
             'all_installed': all(packages.values()),
@@ -167,7 +167,7 @@ def main():
                 config_summary = diagnostics.get('configuration', {}).get('summary', {})
                 print(f"\nConfiguration Summary:")
                 for section, details in config_summary.items():
-                    print(f"  {section}: {details}")
+                    print(f"  {section}: {dict(details)}")
                 
                 return 0 if diagnostics['system_status'] == 'healthy' else 1
             
@@ -193,7 +193,7 @@ def main():
             print("\n📦 To install packages, run:")
             print("   install_packages.bat")
             print("\n🔧 Or install manually:")
-            print("   pip install Pillow reportlab pandas")
+            print("   pip install Pillow reportlab")
             print("\n📋 Then test with:")
             print("   python main.py diagnostics")
         
@@ -7,19 +7,88 @@ from PIL import Image
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.utils import ImageReader
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import Iterator, List, Dict, Tuple, Optional, Union
 import datetime
-from utils import BIMailerLogger, get_png_files, get_file_creation_date, clean_filename
+import io
+import json
+import os
+import time
+from utils import (get_logger, get_png_files, has_png_files, get_file_creation_date, clean_filename, flush_logging,
+                   use_unbuffered_logging)
 from config_manager import ConfigManager
 
 
+# PDFs with up to this many pages are built in memory and written in one go;
+# larger ones are streamed to disk so memory stays bounded
+IN_MEMORY_PDF_MAX_PAGES = 200
+
+# Suffix for output files still being written; they are renamed into place when complete
+PARTIAL_SUFFIX = '.tmp'
+
+# Threads decoding PNGs for one PDF, and how many decoded pages may wait to be drawn
+PNG_DECODE_WORKERS = 4
+PNG_DECODE_AHEAD = 8
+
+# Generator owned by each worker process of PDFGenerator.process_pool
+_worker_generator: Optional['PDFGenerator'] = None
+
+
+def _init_pdf_worker(config_dir: str):
+    """Process pool initializer: build this worker's own config and generator.
+    
+    Workers append to the parent's log files, so they log unbuffered (forked
+    workers are switched over by the fork hook in utils, spawned ones here).
+    """
+    global _worker_generator
+    use_unbuffered_logging()
+    _worker_generator = PDFGenerator(ConfigManager(config_dir))
+
+
+def _generate_pdf_in_worker(folder_name: str, all_pngs: Optional[List[Path]] = None,
+                            return_metadata: bool = False
+                            ) -> Union[Optional[Path], Tuple[Optional[Path], Optional[Dict]]]:
+    """Generate one folder's PDF in a worker process."""
+    try:
+        return _worker_generator.generate_pdf_for_folder(folder_name, return_metadata=return_metadata,
+                                                         all_pngs=all_pngs)
+    finally:
+        # Pool workers exit without atexit handlers; don't lose buffered log lines
+        flush_logging()
+
+
+def _load_png(png_file: Path) -> Image.Image:
+    """Open and fully decode a PNG (PIL releases the GIL while decoding)."""
+    img = Image.open(png_file)
+    try:
+        img.load()
+    except Exception:
+        img.close()
+        raise
+    return img
+
+
+def _iter_decoded(pool: ThreadPoolExecutor, png_files: List[Path]) -> Iterator[Tuple[Path, Future]]:
+    """Yield (png_file, future image) in order, keeping at most PNG_DECODE_AHEAD decodes in flight."""
+    pending = deque()
+    for png_file in png_files:
+        pending.append((png_file, pool.submit(_load_png, png_file)))
+        if len(pending) > PNG_DECODE_AHEAD:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+
 class PDFGenerator:
     """Handles PDF generation from PNG files."""
     
     def __init__(self, config_manager: ConfigManager):
         self.config = config_manager
-        self.logger = BIMailerLogger()
+        self.logger = get_logger()
         
         # Directory paths - handle running from Scripts directory
         base_path = Path("..") if not Path("Input").exists() and Path("../Input").exists() else Path(".")
@@ -30,186 +99,299 @@ class PDFGenerator:
         
         # Ensure output directory exists
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # ALL folder listing shared by every folder's PDF, keyed by the directory's mtime
+        self._all_pngs_cache: Optional[Tuple[float, List[Path]]] = None
+        
+        # Worker processes rendering PDFs while inside process_pool()
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+    
+    @contextmanager
+    def process_pool(self, workers: int):
+        """Render PDFs in worker processes for every generate_pdf_for_folder call inside the block.
+        
+        Folders are independent and decoding is CPU-bound, so calls made from
+        several threads run in parallel, capped at the CPU count. Where worker
+        processes cannot be started, or the pool breaks, each folder is
+        generated in this process instead.
+        """
+        workers = min(workers, os.cpu_count() or 1)
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_pdf_worker,
+                                       initargs=(str(self.config.config_dir),))
+        except (OSError, NotImplementedError) as e:
+            self.logger.log_error("Process pool unavailable, generating PDFs in this process", e)
+            pool = None
+        
+        if pool is None:
+            yield
+            return
+        
+        self.logger.log_file_operation(f"Generating PDFs with up to {workers} worker processes")
+        self._process_pool = pool
+        try:
+            yield
+        finally:
+            self._process_pool = None
+            pool.shutdown()
+    
+    def _get_all_pngs(self) -> List[Path]:
+        """PNG files in the ALL folder, rescanned only when the folder has changed."""
+        try:
+            mtime = os.stat(self.all_folder).st_mtime
+        except FileNotFoundError:
+            return []
+        
+        cached = self._all_pngs_cache
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, get_png_files(self.all_folder, self.config.processing_config.png_file_extensions))
+            self._all_pngs_cache = cached
+        return cached[1]
+    
+    def generate_pdf_for_folder(self, folder_name: str, return_metadata: bool = False,
+                                all_pngs: Optional[List[Path]] = None
+                                ) -> Union[Optional[Path], Tuple[Optional[Path], Optional[Dict]]]:
+        """Generate PDF for a specific folder.
+        
+        With return_metadata, returns (pdf_path, metadata) so callers need not re-read the sidecar JSON.
+        all_pngs defaults to the cached ALL folder listing.
+        """
+        pool = self._process_pool
+        if pool is not None:
+            pdf_path, metadata = self._generate_in_worker_process(pool, folder_name, all_pngs)
+        else:
+            pdf_path, metadata = self._generate_pdf_for_folder(folder_name, all_pngs)
+        return (pdf_path, metadata) if return_metadata else pdf_path
+    
+    def _generate_in_worker_process(self, pool: ProcessPoolExecutor, folder_name: str,
+                                    all_pngs: Optional[List[Path]] = None) -> Tuple[Optional[Path], Optional[Dict]]:
+        """Generate a folder's PDF on the process pool, or in this process if the pool is broken."""
+        try:
+            # The ALL listing is scanned here, once per change, and shipped to the worker
+            if all_pngs is None:
+                all_pngs = self._get_all_pngs()
+            return pool.submit(_generate_pdf_in_worker, folder_name, all_pngs, True).result()
+        except (OSError, BrokenProcessPool) as e:
+            # Only this folder is generated again; folders already finished keep their PDFs
+            self.logger.log_error(f"PDF worker process failed, generating {folder_name} in this process", e)
+            return self._generate_pdf_for_folder(folder_name, all_pngs)
     
-    def generate_pdf_for_folder(self, folder_name: str) -> Optional[Path]:
-        """Generate PDF for a specific folder."""
+    def _generate_pdf_for_folder(self, folder_name: str, all_pngs: Optional[List[Path]] = None
+                                 ) -> Tuple[Optional[Path], Optional[Dict]]:
+        """Generate a folder's PDF; returns (pdf_path, metadata) or (None, None)."""
         try:
             # Get PDF name from configuration
             pdf_name = self.config.get_pdf_name_for_folder(folder_name)
             if not pdf_name:
                 self.logger.log_error(f"No PDF name configured for folder: {folder_name}")
-                return None
+                return None, None
             
             folder_path = self.input_dir / folder_name
             if not folder_path.exists():
                 self.logger.log_error(f"Folder does not exist: {folder_path}")
-                return None
+                return None, None
             
             # Get PNG files from the specific folder
             folder_pngs = get_png_files(folder_path, self.config.processing_config.png_file_extensions)
             
             # Get PNG files from ALL folder (to be included in every PDF)
-            all_pngs = get_png_files(self.all_folder, self.config.processing_config.png_file_extensions)
+            if all_pngs is None:
+                all_pngs = self._get_all_pngs()
             
             # Combine PNG files, avoiding duplicates based on filename
-            # Create a dictionary to track files by name, prioritizing ALL folder files
-            unique_files = {}
-            
-            # Add ALL folder files first (these take priority)
-            for png_file in all_pngs:
-                unique_files[png_file.name] = png_file
+            # ALL folder files come first and take priority; names already used are tracked in a set
+            all_png_files = list(all_pngs)
+            seen_names = {png_file.name for png_file in all_png_files}
+            all_files_used = len(all_png_files)
             
             # Add folder-specific files only if they don't already exist
             for png_file in folder_pngs:
-                if png_file.name not in unique_files:
-                    unique_files[png_file.name] = png_file
-            
-            # Convert back to list, maintaining order (ALL files first, then unique folder files)
-            all_png_files = list(unique_files.values())
+                if png_file.name not in seen_names:
+                    seen_names.add(png_file.name)
+                    all_png_files.append(png_file)
+            folder_files_used = len(all_png_files) - all_files_used
             
             if not all_png_files:
                 self.logger.log_file_operation(f"No PNG files found for folder: {folder_name}")
-                return None
+                return None, None
             
             # Generate PDF
-            pdf_path = self._create_pdf(pdf_name, all_png_files, folder_name)
+            pdf_path, metadata = self._create_pdf(pdf_name, all_png_files, folder_name)
             
             if pdf_path:
-                # Calculate actual counts after deduplication
-                all_files_used = len([f for f in all_png_files if f in all_pngs])
-                folder_files_used = len(all_png_files) - all_files_used
-                
                 self.logger.log_file_operation(
                     f"PDF generated successfully: {pdf_path} "
                     f"({all_files_used} ALL files + {folder_files_used} {folder_name} files, {len(all_png_files)} total unique files)"
                 )
             
-            return pdf_path
+            return pdf_path, metadata
             
         except Exception as e:
             self.logger.log_error(f"Failed to generate PDF for folder {folder_name}", e)
-            return None
+            return None, None
     
-    def _create_pdf(self, pdf_name: str, png_files: List[Path], folder_name: str) -> Optional[Path]:
-        """Create PDF from list of PNG files."""
+    def _create_pdf(self, pdf_name: str, png_files: List[Path], folder_name: str) -> Tuple[Optional[Path], Optional[Dict]]:
+        """Create PDF from list of PNG files; returns (pdf_path, metadata) or (None, None)."""
+        partial_path = None
         try:
             # Clean PDF name for filename
             clean_pdf_name = clean_filename(pdf_name)
-            timestamp = datetime.datetime.now().strftime(self.config.processing_config.timestamp_format)
+            # One clock reading names the file and stamps its metadata
+            now = datetime.datetime.now()
+            timestamp = now.strftime(self.config.processing_config.timestamp_format)
             pdf_filename = f"{clean_pdf_name}_{timestamp}.pdf"
             pdf_path = self.output_dir / pdf_filename
+            # The PDF only appears under its real name once complete, so no reader sees a partial file
+            partial_path = pdf_path.with_name(pdf_path.name + PARTIAL_SUFFIX)
             
-            # Create PDF
-            c = canvas.Canvas(str(pdf_path))
+            # Create PDF, in memory unless it is large enough to stream to disk
+            buf = io.BytesIO() if len(png_files) <= IN_MEMORY_PDF_MAX_PAGES else None
+            c = canvas.Canvas(buf if buf is not None else str(partial_path))
             
             file_info_list = []
             
-            for png_file in png_files:
-                try:
-                    # Get image dimensions and DPI information
-                    with Image.open(png_file) as img:
-                        img_width, img_height = img.size
+            # Upcoming PNGs decode on the pool while earlier pages are drawn; pages keep their order
+            with ThreadPoolExecutor(max_workers=min(PNG_DECODE_WORKERS, len(png_files) or 1)) as decode_pool:
+                for png_file, decoded in _iter_decoded(decode_pool, png_files):
+                    try:
+                        # Decode each PNG once: the same image supplies dimensions, DPI and the page content
+                        with decoded.result() as img:
+                            img_width, img_height = img.size
+                            
+                            # Get actual DPI from image metadata, fallback to 96 if not available
+                            dpi = img.info.get('dpi', (96, 96))
+                            if isinstance(dpi, tuple):
+                                dpi_x, dpi_y = dpi
+                            else:
+                                dpi_x = dpi_y = dpi
+                            
+                            # Use the higher DPI value for better quality
+                            actual_dpi = max(dpi_x, dpi_y)
+                            
+                            # For high-resolution images, maintain quality by using proper scaling
+                            if actual_dpi > 150:
+                                # High-res image: use actual DPI for precise scaling
+                                page_width = img_width * 72 / actual_dpi
+                                page_height = img_height * 72 / actual_dpi
+                            else:
+                                # Standard resolution: use 96 DPI assumption but with better scaling
+                                page_width = img_width * 72 / 96
+                                page_height = img_height * 72 / 96
+                            
+                            # Set page size to match image
+                            c.setPageSize((page_width, page_height))
+                            
+                            # Hand the open image to reportlab instead of letting it re-open and re-decode the file
+                            img_reader = ImageReader(self._prepare_page_image(img, page_width, page_height))
+                            
+                            # Add image to PDF with maximum quality settings
+                            # Use ImageReader for better compression control
+                            c.drawImage(img_reader, 0, 0, 
+                                      width=page_width, height=page_height,
+                                      preserveAspectRatio=True, anchor='c')
+                        
+                        # One stat supplies both the creation date and the size
+                        st = png_file.stat()
+                        file_info_list.append({
+                            'filename': png_file.name,
+                            'creation_date': get_file_creation_date(st),
+                            'size': st.st_size,
+                            'dimensions': f"{img_width}x{img_height}"
+                        })
                         
-                        # Get actual DPI from image metadata, fallback to 96 if not available
-                        dpi = img.info.get('dpi', (96, 96))
-                        if isinstance(dpi, tuple):
-                            dpi_x, dpi_y = dpi
-                        else:
-                            dpi_x = dpi_y = dpi
+                        # Finish the page
+                        c.showPage()
                         
-                        # Use the higher DPI value for better quality
-                        actual_dpi = max(dpi_x, dpi_y)
+                        self.logger.log_file_operation(
+                            "Added to PDF: %s (%dx%d)", png_file.name, img_width, img_height
+                        )
                         
-                        # For high-resolution images, maintain quality by using proper scaling
-                        if actual_dpi > 150:
-                            # High-res image: use actual DPI for precise scaling
-                            page_width = img_width * 72 / actual_dpi
-                            page_height = img_height * 72 / actual_dpi
-                        else:
-                            # Standard resolution: use 96 DPI assumption but with better scaling
-                            page_width = img_width * 72 / 96
-                            page_height = img_height * 72 / 96
-                    
-                    # Set page size to match image
-                    c.setPageSize((page_width, page_height))
-                    
-                    # Create ImageReader for better quality control
-                    img_reader = ImageReader(str(png_file))
-                    
-                    # Add image to PDF with maximum quality settings
-                    # Use ImageReader for better compression control
-                    c.drawImage(img_reader, 0, 0, 
-                              width=page_width, height=page_height,
-                              preserveAspectRatio=True, anchor='c')
-                    
-                    # Get file creation date
-                    creation_date = get_file_creation_date(png_file)
-                    file_info_list.append({
-                        'filename': png_file.name,
-                        'creation_date': creation_date,
-                        'size': png_file.stat().st_size,
-                        'dimensions': f"{img_width}x{img_height}"
-                    })
-                    
-                    # Finish the page
-                    c.showPage()
-                    
-                    self.logger.log_file_operation(
-                        f"Added to PDF: {png_file.name} ({img_width}x{img_height})"
-                    )
-                    
-                except Exception as e:
-                    self.logger.log_error(f"Failed to process PNG file: {png_file}", e)
-                    continue
+                    except Exception as e:
+                        self.logger.log_error(f"Failed to process PNG file: {png_file}", e)
+                        continue
             
             # Save PDF
             c.save()
+            if buf is not None:
+                data = buf.getvalue()
+                partial_path.write_bytes(data)
+                pdf_size = len(data)
+            else:
+                pdf_size = partial_path.stat().st_size
             
             # Log PDF creation details
-            pdf_size = pdf_path.stat().st_size
             self.logger.log_file_operation(
                 f"PDF created: {pdf_path.name} "
                 f"(Size: {pdf_size / 1024 / 1024:.2f} MB, Pages: {len(file_info_list)})"
             )
             
-            # Store file information for email template
-            self._store_pdf_metadata(pdf_path, pdf_name, folder_name, file_info_list)
+            # Store file information for email template, then publish the PDF after its metadata
+            metadata = self._store_pdf_metadata(pdf_path, pdf_name, folder_name, file_info_list, now=now)
+            os.replace(partial_path, pdf_path)
             
-            return pdf_path
+            return pdf_path, metadata
             
         except Exception as e:
             self.logger.log_error(f"Failed to create PDF: {pdf_name}", e)
-            return None
+            if partial_path is not None:
+                try:
+                    partial_path.unlink()
+                except OSError:
+                    pass
+            return None, None
     
-    def _store_pdf_metadata(self, pdf_path: Path, pdf_name: str, folder_name: str, file_info_list: List[Dict]):
-        """Store PDF metadata for use in email templates."""
+    def _prepare_page_image(self, img: Image.Image, page_width: float, page_height: float):
+        """Optionally downscale and JPEG-encode a page image; returns what ImageReader should read."""
+        processing = self.config.processing_config
+        
+        if processing.pdf_max_image_dpi > 0:
+            # Only shrink images well beyond what the printed page size can show
+            target = (max(1, round(page_width * processing.pdf_max_image_dpi / 72)),
+                      max(1, round(page_height * processing.pdf_max_image_dpi / 72)))
+            if img.width > target[0] * 1.5 or img.height > target[1] * 1.5:
+                img.thumbnail(target, Image.BICUBIC)
+        
+        if processing.pdf_jpeg_quality > 0 and img.mode in ('RGB', 'L'):
+            # Images without alpha embed far more compactly as JPEG
+            buf = io.BytesIO()
+            img.save(buf, 'JPEG', quality=processing.pdf_jpeg_quality, optimize=True)
+            buf.seek(0)
+            return buf
+        
+        return img
+    
+    def _store_pdf_metadata(self, pdf_path: Path, pdf_name: str, folder_name: str, file_info_list: List[Dict],
+                            now: Optional[datetime.datetime] = None) -> Dict:
+        """Store PDF metadata for use in email templates and return it."""
+        metadata = {
+            'pdf_path': str(pdf_path),
+            'pdf_name': pdf_name,
+            'folder_name': folder_name,
+            'creation_timestamp': (now or datetime.datetime.now()).isoformat(),
+            'file_count': len(file_info_list),
+            'files': file_info_list
+        }
+        
         try:
-            metadata = {
-                'pdf_path': str(pdf_path),
-                'pdf_name': pdf_name,
-                'folder_name': folder_name,
-                'creation_timestamp': datetime.datetime.now().isoformat(),
-                'file_count': len(file_info_list),
-                'files': file_info_list
-            }
-            
             # Store metadata in a JSON file alongside the PDF
             metadata_path = pdf_path.with_suffix('.json')
-            import json
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2, default=str)
+            partial_metadata_path = metadata_path.with_name(metadata_path.name + PARTIAL_SUFFIX)
+            # Serialize compactly first so the file gets a single write, then rename it into place
+            partial_metadata_path.write_text(json.dumps(metadata, separators=(',', ':'), default=str))
+            os.replace(partial_metadata_path, metadata_path)
             
             self.logger.log_file_operation(f"PDF metadata stored: {metadata_path}")
             
         except Exception as e:
             self.logger.log_error(f"Failed to store PDF metadata for {pdf_path}", e)
+        
+        return metadata
     
     def get_pdf_metadata(self, pdf_path: Path) -> Optional[Dict]:
         """Retrieve PDF metadata."""
         try:
             metadata_path = pdf_path.with_suffix('.json')
             if metadata_path.exists():
-                import json
                 with open(metadata_path, 'r') as f:
                     return json.load(f)
             return None
@@ -217,30 +399,49 @@ class PDFGenerator:
             self.logger.log_error(f"Failed to load PDF metadata for {pdf_path}", e)
             return None
     
-    def generate_pdfs_for_all_folders(self) -> Dict[str, Optional[Path]]:
-        """Generate PDFs for all configured folders that have PNG files."""
-        results = {}
+    def generate_pdfs_for_all_folders(self, folder_names: Optional[List[str]] = None, return_metadata: bool = False
+                                      ) -> Dict[str, Union[Optional[Path], Tuple[Optional[Path], Optional[Dict]]]]:
+        """Generate PDFs for all configured folders that have PNG files.
         
-        # Get all configured folder names
-        folder_names = self.config.get_all_folder_names()
+        Pass folder_names (e.g. from get_folders_with_new_pngs) to skip rescanning for them.
+        With return_metadata, each value is (pdf_path, metadata) as from generate_pdf_for_folder.
+        """
+        results = {}
         
-        # Filter out 'ALL' folder as it's used for global headers
-        folder_names = [name for name in folder_names if name != 'ALL']
+        if folder_names is None:
+            # Get all configured folder names
+            folder_names = self.config.get_all_folder_names()
+            
+            # Filter out 'ALL' folder as it's used for global headers
+            folder_names = [name for name in folder_names if name != 'ALL']
         
         self.logger.log_file_operation(f"Starting PDF generation for {len(folder_names)} folders")
         
-        for folder_name in folder_names:
-            self.logger.log_file_operation(f"Processing folder: {folder_name}")
-            pdf_path = self.generate_pdf_for_folder(folder_name)
-            results[folder_name] = pdf_path
+        if len(folder_names) > 1:
+            results = self._generate_folders_parallel(folder_names, return_metadata)
+        else:
+            for folder_name in folder_names:
+                self.logger.log_file_operation(f"Processing folder: {folder_name}")
+                results[folder_name] = self.generate_pdf_for_folder(folder_name, return_metadata=return_metadata)
         
-        successful_pdfs = [path for path in results.values() if path is not None]
+        successful_pdfs = [result for result in results.values()
+                           if (result[0] if return_metadata else result) is not None]
         self.logger.log_file_operation(
             f"PDF generation completed: {len(successful_pdfs)}/{len(folder_names)} successful"
         )
         
         return results
     
+    def _generate_folders_parallel(self, folder_names: List[str], return_metadata: bool = False
+                                   ) -> Dict[str, Union[Optional[Path], Tuple[Optional[Path], Optional[Dict]]]]:
+        """Generate folders' PDFs concurrently on the process pool (see process_pool)."""
+        workers = min(len(folder_names), os.cpu_count() or 1)
+        
+        with self.process_pool(workers), ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(folder_names, executor.map(
+                lambda name: self.generate_pdf_for_folder(name, return_metadata=return_metadata), folder_names
+            )))
+    
     def validate_pdf_size(self, pdf_path: Path) -> bool:
         """Validate PDF size against maximum attachment size."""
         try:
@@ -269,31 +470,30 @@ class PDFGenerator:
         # Filter out 'ALL' folder
         folder_names = [name for name in folder_names if name != 'ALL']
         
+        extensions = self.config.processing_config.png_file_extensions
         for folder_name in folder_names:
-            folder_path = self.input_dir / folder_name
-            if folder_path.exists():
-                png_files = get_png_files(folder_path, self.config.processing_config.png_file_extensions)
-                if png_files:
-                    folders_with_pngs.append(folder_name)
+            # One scandir per folder, stopping at the first PNG (missing folders have none)
+            if has_png_files(self.input_dir / folder_name, extensions):
+                folders_with_pngs.append(folder_name)
         
         return folders_with_pngs
     
     def cleanup_old_pdfs(self, keep_days: int = 7):
         """Clean up old PDF files from output directory."""
         try:
-            cutoff_date = datetime.datetime.now() - datetime.timedelta(days=keep_days)
-            
-            pdf_files = list(self.output_dir.glob('*.pdf'))
-            metadata_files = list(self.output_dir.glob('*.json'))
+            cutoff = time.time() - keep_days * 86400
             
             cleaned_count = 0
             
-            for file_path in pdf_files + metadata_files:
-                file_date = datetime.datetime.fromtimestamp(file_path.stat().st_mtime)
-                if file_date < cutoff_date:
-                    file_path.unlink()
-                    cleaned_count += 1
-                    self.logger.log_file_operation(f"Cleaned up old file: {file_path}")
+            # One directory pass covers PDFs, their metadata and partial files left by a crash
+            with os.scandir(self.output_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(('.pdf', '.json', PARTIAL_SUFFIX)):
+                        continue
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        cleaned_count += 1
+                        self.logger.log_file_operation("Cleaned up old file: %s", entry.path)
             
             if cleaned_count > 0:
                 self.logger.log_file_operation(f"Cleaned up {cleaned_count} old files from output directory")
@@ -314,7 +514,7 @@ if __name__ == "__main__":
         
         # Generate PDFs for all folders
         if folders:
-            results = pdf_generator.generate_pdfs_for_all_folders()
+            results = pdf_generator.generate_pdfs_for_all_folders(folders)
             print("PDF Generation Results:")
             for folder, pdf_path in results.items():
                 if pdf_path:
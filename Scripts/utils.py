@@ -3,13 +3,192 @@ Utility functions for BIMailer automation system.
 Handles logging, lock management, date functions, and common utilities.
 """
 
+import atexit
 import os
+import queue
+import re
 import logging
+import logging.handlers
 import datetime
+import threading
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List, Tuple, Union
 import time
-import json
+
+
+# Patterns compiled once at import time; used for every mailing list row
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_EMAIL_SPLIT_RE = re.compile(r'\s*;\s*')
+# Characters not allowed in Windows filenames
+_INVALID_FN_RE = re.compile(r'[<>:"/\\|?*]')
+
+# Units used by format_file_size
+_SIZE_UNITS = ("B", "KB", "MB", "GB")
+
+# Write buffer for log files; records are flushed when it fills, on errors and at exit
+LOG_BUFFER_SIZE = 64 * 1024
+
+# Logger name -> (log file path, listener writing its records on a background thread)
+_LOG_LISTENERS: Dict[str, Tuple[str, logging.handlers.QueueListener]] = {}
+_LOG_LISTENERS_LOCK = threading.Lock()
+
+# Set in worker processes that share the log files with their parent; see use_unbuffered_logging
+_UNBUFFERED_LOG_FILES = False
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """File handler that buffers writes instead of flushing after every record."""
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=LOG_BUFFER_SIZE,
+                    encoding=self.encoding, errors=getattr(self, 'errors', None))
+    
+    def flush(self):
+        # StreamHandler.emit() flushes per record; leave it to the buffer
+        pass
+    
+    def flush_buffer(self):
+        """Write buffered records to the file now."""
+        logging.FileHandler.flush(self)
+    
+    def emit(self, record: logging.LogRecord):
+        super().emit(record)
+        if record.levelno >= logging.ERROR:
+            # Errors reach disk immediately in case the process dies
+            self.flush_buffer()
+
+
+def _stop_listener(name: str):
+    """Drain and stop a logger's background listener, closing its handlers."""
+    _, listener = _LOG_LISTENERS.pop(name)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+def _start_log_listener(logger: logging.Logger, log_path: str):
+    """Route a logger through a queue to file and console handlers on a background thread.
+    
+    Call with _LOG_LISTENERS_LOCK held.
+    """
+    # File handler; unbuffered in worker processes so each record is a single append
+    file_handler_class = logging.FileHandler if _UNBUFFERED_LOG_FILES else _BufferedFileHandler
+    file_handler = file_handler_class(log_path, encoding='utf-8')
+    file_handler.setLevel(logging.INFO)
+    
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    
+    # Formatter
+    formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    
+    file_handler.setFormatter(formatter)
+    console_handler.setFormatter(formatter)
+    
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    _LOG_LISTENERS[logger.name] = (log_path, listener)
+    
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+
+def use_unbuffered_logging():
+    """Write every log record to its file as soon as it is handled, from now on.
+    
+    For worker processes appending to the same log files as their parent: each
+    record becomes one O_APPEND write, so lines from different processes never
+    interleave. Call flush_logging before a worker finishes a task, since pool
+    workers exit without running atexit handlers.
+    """
+    global _UNBUFFERED_LOG_FILES
+    with _LOG_LISTENERS_LOCK:
+        if _UNBUFFERED_LOG_FILES:
+            return
+        _UNBUFFERED_LOG_FILES = True
+        for name, (log_path, _) in list(_LOG_LISTENERS.items()):
+            _stop_listener(name)
+            logger = logging.getLogger(name)
+            logger.handlers.clear()
+            _start_log_listener(logger, log_path)
+
+
+def _before_fork():
+    """Flush log buffers and hold the handlers, so a forked child inherits no pending output."""
+    _LOG_LISTENERS_LOCK.acquire()
+    for _, listener in _LOG_LISTENERS.values():
+        for handler in listener.handlers:
+            handler.acquire()
+            if isinstance(handler, _BufferedFileHandler):
+                handler.flush_buffer()
+
+
+def _after_fork_in_parent():
+    for _, listener in _LOG_LISTENERS.values():
+        for handler in listener.handlers:
+            handler.release()
+    _LOG_LISTENERS_LOCK.release()
+
+
+def _after_fork_in_child():
+    """Replace the inherited listeners with fresh, unbuffered ones.
+    
+    The parent's listener threads do not exist in the child and their queues may
+    have been locked mid-operation, so they are never stopped or restarted here.
+    Their buffers were flushed before the fork, so closing the handlers writes nothing.
+    """
+    global _LOG_LISTENERS_LOCK, _UNBUFFERED_LOG_FILES
+    _LOG_LISTENERS_LOCK = threading.Lock()
+    _UNBUFFERED_LOG_FILES = True
+    
+    inherited = list(_LOG_LISTENERS.items())
+    _LOG_LISTENERS.clear()
+    for name, (log_path, listener) in inherited:
+        for handler in listener.handlers:
+            handler.close()
+        logger = logging.getLogger(name)
+        logger.handlers.clear()
+        _start_log_listener(logger, log_path)
+
+
+if hasattr(os, 'register_at_fork'):
+    # Not available on Windows, where worker processes are always spawned
+    os.register_at_fork(before=_before_fork, after_in_parent=_after_fork_in_parent,
+                        after_in_child=_after_fork_in_child)
+
+
+def flush_logging():
+    """Write out all queued log records now, keeping logging running.
+    
+    For processes that exit without running atexit handlers (pool workers).
+    """
+    with _LOG_LISTENERS_LOCK:
+        for _, listener in _LOG_LISTENERS.values():
+            # stop() drains the queue; start() resumes with a fresh thread
+            listener.stop()
+            for handler in listener.handlers:
+                if isinstance(handler, _BufferedFileHandler):
+                    handler.flush_buffer()
+                else:
+                    handler.flush()
+            listener.start()
+
+
+def shutdown_logging():
+    """Write out all queued log records and close the log files."""
+    with _LOG_LISTENERS_LOCK:
+        for name in list(_LOG_LISTENERS):
+            _stop_listener(name)
+            logging.getLogger(name).handlers.clear()
+
+
+atexit.register(shutdown_logging)
 
 
 class BIMailerLogger:
@@ -52,42 +231,42 @@ class BIMailerLogger:
         )
     
     def _create_logger(self, name: str, filename: str) -> logging.Logger:
-        """Create a logger with file and console handlers."""
+        """Create a logger with file and console handlers.
+        
+        Callers only enqueue records; a background listener formats and writes
+        them, so logging adds no write() syscalls to the processing path.
+        """
         logger = logging.getLogger(name)
         logger.setLevel(logging.INFO)
+        log_path = str(self.logs_dir / filename)
         
-        # Clear existing handlers
-        logger.handlers.clear()
-        
-        # File handler
-        file_handler = logging.FileHandler(self.logs_dir / filename, encoding='utf-8')
-        file_handler.setLevel(logging.INFO)
-        
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        
-        # Formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        with _LOG_LISTENERS_LOCK:
+            current = _LOG_LISTENERS.get(name)
+            if current is not None and current[0] == log_path and logger.handlers:
+                # Listener for this logger already writes to this file (a repeat setup, e.g. a second
+                # BIMailerLogger for the same Logs directory); reuse it instead of starting another
+                return logger
+            
+            if current is not None:
+                _stop_listener(name)
+            
+            # Clear existing handlers
+            logger.handlers.clear()
+            
+            _start_log_listener(logger, log_path)
         
         return logger
     
-    def log_file_operation(self, message: str, level: str = 'info'):
-        """Log file processing operations."""
-        getattr(self.file_logger, level.lower())(message)
+    def log_file_operation(self, message: str, *args, level: str = 'info'):
+        """Log file processing operations.
+        
+        Extra positional args are %-style arguments, only formatted if the record is emitted.
+        """
+        getattr(self.file_logger, level.lower())(message, *args)
     
-    def log_email_operation(self, message: str, level: str = 'info'):
-        """Log email operations."""
-        getattr(self.email_logger, level.lower())(message)
+    def log_email_operation(self, message: str, *args, level: str = 'info'):
+        """Log email operations (supports %-style args like log_file_operation)."""
+        getattr(self.email_logger, level.lower())(message, *args)
     
     def log_error(self, message: str, exception: Optional[Exception] = None):
         """Log errors with optional exception details."""
@@ -96,9 +275,39 @@ class BIMailerLogger:
         else:
             self.error_logger.error(message)
     
-    def log_summary(self, message: str):
-        """Log processing summary information."""
-        self.summary_logger.info(message)
+    def log_summary(self, message: str, *args):
+        """Log processing summary information (supports %-style args)."""
+        self.summary_logger.info(message, *args)
+
+
+def _pid_exited(pid: int) -> bool:
+    """True if no process with this PID exists (always False where that cannot be checked)."""
+    if os.name == 'nt':
+        # os.kill(pid, 0) would send CTRL_C_EVENT on Windows; rely on the lock timeout there
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        # Exists but owned by another user
+        return False
+    return False
+
+
+# Process-wide logger shared by every component; see get_logger
+_SHARED_LOGGER: Optional[BIMailerLogger] = None
+_SHARED_LOGGER_LOCK = threading.Lock()
+
+
+def get_logger() -> BIMailerLogger:
+    """Return the process-wide BIMailerLogger, creating it on first use."""
+    global _SHARED_LOGGER
+    if _SHARED_LOGGER is None:
+        with _SHARED_LOGGER_LOCK:
+            if _SHARED_LOGGER is None:
+                _SHARED_LOGGER = BIMailerLogger()
+    return _SHARED_LOGGER
 
 
 class ProcessingLock:
@@ -107,43 +316,117 @@ class ProcessingLock:
     def __init__(self, lock_file: str = ".lock", timeout_minutes: int = 30):
         self.lock_file = Path(lock_file)
         self.timeout_minutes = timeout_minutes
-        self.logger = BIMailerLogger().file_logger
+        self.logger = get_logger().file_logger
+        
+        # Descriptor of the lock file while this instance holds it
+        self._fd: Optional[int] = None
     
     def acquire_lock(self) -> bool:
-        """Acquire processing lock. Returns True if successful."""
+        """Acquire processing lock. Returns True if successful.
+        
+        The lock file is created atomically (O_CREAT | O_EXCL), so there is no
+        window between checking for a lock and taking it. An existing lock is
+        replaced once if its owner process has exited or it is older than the timeout.
+        """
         try:
-            if self.lock_file.exists():
-                # Check if lock is stale
-                lock_time = datetime.datetime.fromtimestamp(self.lock_file.stat().st_mtime)
-                current_time = datetime.datetime.now()
+            for attempt in range(2):
+                try:
+                    fd = os.open(self.lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+                except FileExistsError:
+                    stale = self._stale_reason() if attempt == 0 else None
+                    if stale is None:
+                        self.logger.error("Processing already in progress (lock file exists)")
+                        return False
+                    stale_reason, stale_stat = stale
+                    if stale_stat is not None and not self._take_over_stale(stale_stat):
+                        self.logger.error("Processing already in progress (lock file was replaced)")
+                        return False
+                    self.logger.warning(f"Removed stale lock file ({stale_reason})")
+                    continue
                 
-                if (current_time - lock_time).total_seconds() > (self.timeout_minutes * 60):
-                    self.logger.warning(f"Removing stale lock file (older than {self.timeout_minutes} minutes)")
-                    self.lock_file.unlink()
-                else:
-                    self.logger.error("Processing already in progress (lock file exists)")
-                    return False
-            
-            # Create lock file
-            lock_data = {
-                'timestamp': datetime.datetime.now().isoformat(),
-                'pid': os.getpid()
-            }
-            
-            with open(self.lock_file, 'w') as f:
-                json.dump(lock_data, f, indent=2)
+                # Record the owner so later runs can detect a dead process: "<pid>\n<unix time>\n"
+                os.write(fd, f"{os.getpid()}\n{time.time():.0f}\n".encode('ascii'))
+                self._fd = fd
+                
+                self.logger.info("Processing lock acquired")
+                return True
             
-            self.logger.info("Processing lock acquired")
-            return True
+            return False
             
         except Exception as e:
             self.logger.error(f"Failed to acquire processing lock: {e}")
             return False
     
+    def _stale_reason(self) -> Optional[Tuple[str, Optional[os.stat_result]]]:
+        """Why the existing lock file can be taken over, with the stat it was judged on.
+        
+        Returns None if the lock is still held.
+        """
+        try:
+            st = os.stat(self.lock_file)
+        except FileNotFoundError:
+            return "already released", None
+        
+        try:
+            with open(self.lock_file, 'r', encoding='ascii') as f:
+                pid = int(f.readline())
+        except (OSError, ValueError):
+            # Unreadable or older JSON-format lock: fall back to the age check
+            pid = 0
+        
+        if pid and pid != os.getpid() and _pid_exited(pid):
+            return f"owner process {pid} is no longer running", st
+        
+        if time.time() - st.st_mtime > self.timeout_minutes * 60:
+            return f"older than {self.timeout_minutes} minutes", st
+        
+        return None
+    
+    def _take_over_stale(self, stale_stat: os.stat_result) -> bool:
+        """Move a stale lock file out of the way. Returns False if it was replaced meanwhile.
+        
+        Two runs can find the same stale lock; unlinking by name could delete
+        the fresh lock the other one just created. The file is instead renamed
+        atomically to a unique name and checked to be the one judged stale
+        (same inode and mtime) before it is deleted.
+        """
+        moved = self.lock_file.with_name(f"{self.lock_file.name}.stale.{os.getpid()}.{time.monotonic_ns()}")
+        try:
+            os.rename(self.lock_file, moved)
+        except FileNotFoundError:
+            # Another run already took it over; compete for the new lock via O_EXCL
+            return True
+        except OSError:
+            # Still open by its owner (Windows refuses the rename), so not stale
+            return False
+        
+        st = os.stat(moved)
+        if (st.st_dev, st.st_ino, st.st_mtime_ns) == (stale_stat.st_dev, stale_stat.st_ino, stale_stat.st_mtime_ns):
+            os.unlink(moved)
+            return True
+        
+        # A fresh lock took its place: put it back unless yet another one exists
+        try:
+            os.link(moved, self.lock_file)
+        except OSError:
+            pass
+        os.unlink(moved)
+        return False
+    
     def release_lock(self):
         """Release processing lock."""
         try:
-            if self.lock_file.exists():
+            if self._fd is None:
+                return
+            held = os.fstat(self._fd)
+            os.close(self._fd)
+            self._fd = None
+            try:
+                st = os.stat(self.lock_file)
+            except FileNotFoundError:
+                return
+            # Only remove our own lock, not one created after ours was taken over as stale
+            if (st.st_dev, st.st_ino) == (held.st_dev, held.st_ino):
                 self.lock_file.unlink()
                 self.logger.info("Processing lock released")
         except Exception as e:
@@ -170,10 +453,11 @@ def get_current_timestamp(format_str: str = "%Y-%m-%d_%H-%M-%S") -> str:
     return datetime.datetime.now().strftime(format_str)
 
 
-def get_file_creation_date(file_path: Path) -> datetime.datetime:
-    """Get file creation date."""
+def get_file_creation_date(path_or_stat: Union[Path, os.stat_result]) -> datetime.datetime:
+    """Get file creation date from a path, or from a stat result the caller already has."""
     try:
-        return datetime.datetime.fromtimestamp(file_path.stat().st_ctime)
+        st = path_or_stat if isinstance(path_or_stat, os.stat_result) else path_or_stat.stat()
+        return datetime.datetime.fromtimestamp(st.st_ctime)
     except Exception:
         return datetime.datetime.now()
 
@@ -183,26 +467,20 @@ def format_file_size(size_bytes: int) -> str:
     if size_bytes == 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB"]
-    i = 0
-    while size_bytes >= 1024 and i < len(size_names) - 1:
-        size_bytes /= 1024.0
-        i += 1
-    
-    return f"{size_bytes:.1f} {size_names[i]}"
+    # Each unit is 2**10 of the previous one, so the bit length picks it directly
+    i = 0 if size_bytes < 1024 else min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
 
 
 def validate_email(email: str) -> bool:
     """Basic email validation."""
-    import re
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 
 def split_email_list(email_string) -> List[str]:
     """Split semicolon-separated email list and validate."""
     # Handle NaN values from pandas
-    if email_string is None or (hasattr(email_string, '__class__') and email_string.__class__.__name__ == 'float'):
+    if email_string is None or isinstance(email_string, float):
         return []
     
     # Convert to string and check if empty
@@ -210,12 +488,14 @@ def split_email_list(email_string) -> List[str]:
     if not email_string or email_string.strip() == '' or email_string.lower() == 'nan':
         return []
     
-    emails = [email.strip() for email in email_string.split(';')]
-    valid_emails = [email for email in emails if validate_email(email)]
+    # Validate each address once, sorting it into the valid or invalid list
+    valid_emails, invalid_emails = [], []
+    match = _EMAIL_RE.match
+    for email in _EMAIL_SPLIT_RE.split(email_string.strip()):
+        (valid_emails if match(email) else invalid_emails).append(email)
     
-    if len(valid_emails) != len(emails):
-        logger = BIMailerLogger().error_logger
-        invalid_emails = [email for email in emails if not validate_email(email)]
+    if invalid_emails:
+        logger = get_logger().error_logger
         logger.warning(f"Invalid email addresses found: {invalid_emails}")
     
     return valid_emails
@@ -228,24 +508,42 @@ def ensure_directory_exists(directory: Path):
 
 def clean_filename(filename: str) -> str:
     """Clean filename by removing invalid characters."""
-    import re
-    # Remove invalid characters for Windows filenames
-    invalid_chars = r'[<>:"/\\|?*]'
-    cleaned = re.sub(invalid_chars, '_', filename)
+    # Most names are already clean; only substitute when something matches
+    if _INVALID_FN_RE.search(filename) is None:
+        return filename.strip()
+    cleaned = _INVALID_FN_RE.sub('_', filename)
     return cleaned.strip()
 
 
-def get_png_files(directory: Path, extensions: List[str] = ['.png', '.PNG']) -> List[Path]:
-    """Get all PNG files in directory sorted alphabetically."""
-    png_files = []
-    
-    if not directory.exists():
-        return png_files
-    
-    for ext in extensions:
-        png_files.extend(directory.glob(f'*{ext}'))
-    
-    return sorted(png_files)
+def scan_png_files(directory: Path, extensions: Iterable[str] = ('.png',)) -> List[os.DirEntry]:
+    """List PNG file entries in directory in one scandir pass (unsorted; extensions match case-insensitively)."""
+    extensions = {ext.lower() for ext in extensions}
+    try:
+        with os.scandir(directory) as entries:
+            return [
+                entry for entry in entries
+                if os.path.splitext(entry.name)[1].lower() in extensions and entry.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+
+
+def has_png_files(directory: Path, extensions: Iterable[str] = ('.png',)) -> bool:
+    """Check whether directory contains any PNG file, stopping at the first match."""
+    extensions = {ext.lower() for ext in extensions}
+    try:
+        with os.scandir(directory) as entries:
+            return any(
+                os.path.splitext(entry.name)[1].lower() in extensions and entry.is_file()
+                for entry in entries
+            )
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+
+def get_png_files(directory: Path, extensions: Iterable[str] = ('.png',)) -> List[Path]:
+    """Get all PNG files in directory sorted alphabetically (extensions match case-insensitively)."""
+    return sorted(Path(entry.path) for entry in scan_png_files(directory, extensions))
 
 
 def replace_date_placeholders(text: str, date_format: str = "%Y-%m-%d") -> str:
@@ -7,7 +7,7 @@ print(f"Python executable: {sys.executable}")
 print(f"Python version: {sys.version}")
 print()
 
-packages_to_check = ['PIL', 'reportlab', 'pandas']
+packages_to_check = ['PIL', 'reportlab']
 
 print("Package Status:")
 for package in packages_to_check:
@@ -18,9 +18,6 @@ for package in packages_to_check:
         elif package == 'reportlab':
             import reportlab
             print(f"✅ reportlab: Available - Version {reportlab.Version}")
-        elif package == 'pandas':
-            import pandas
-            print(f"✅ pandas: Available - Version {pandas.__version__}")
     except ImportError:
         print(f"❌ {package}: Not available")
     except Exception as e:
@@ -32,4 +29,4 @@ print("1. Make sure you're using the same Python environment")
 print("2. If using a virtual environment, activate it first:")
 print("   .venv\\Scripts\\activate")
 print("3. Then install packages in that environment:")
-print("   pip install Pillow reportlab pandas")
+print("   pip install Pillow reportlab")
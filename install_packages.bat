@@ -13,7 +13,6 @@ echo.
 echo Installing required packages...
 pip install Pillow>=9.0.0
 pip install reportlab>=3.6.0
-pip install pandas>=1.3.0
 
 echo.
 echo Installation complete!
@@ -121,6 +121,65 @@ def test_config_files():
         print(f"✗ Configuration files test failed: {e}")
         return False
 
+def test_archive_expiry_log():
+    """Test archive retention when archiving and cleanup run from different working directories."""
+    import tempfile
+    import time
+    from types import SimpleNamespace
+    
+    original_cwd = os.getcwd()
+    try:
+        from file_manager import FileManager
+        from utils import get_logger
+        
+        # Create the shared logger before leaving the repository root
+        get_logger()
+        
+        config = SimpleNamespace(
+            general_config=SimpleNamespace(log_retention_days=1, cleanup_delete_qps=0),
+            processing_config=SimpleNamespace(
+                archive_after_processing=True,
+                timestamp_format="%Y-%m-%d_%H-%M-%S",
+                png_file_extensions=frozenset({'.png'})
+            )
+        )
+        
+        with tempfile.TemporaryDirectory() as root:
+            root = Path(root)
+            (root / "Scripts").mkdir()
+            (root / "Archive").mkdir()
+            png_path = root / "Input" / "GroupA" / "old.png"
+            png_path.parent.mkdir(parents=True)
+            png_path.write_bytes(b"")
+            ten_days_ago = time.time() - 10 * 86400
+            os.utime(png_path, (ten_days_ago, ten_days_ago))
+            
+            # Seed the (empty) expiry log and archive the PNG as a run from Scripts/ would
+            os.chdir(root / "Scripts")
+            file_manager = FileManager(config)
+            file_manager.cleanup_old_archives()
+            if not file_manager.archive_processed_pngs("GroupA"):
+                print("✗ Archiving from Scripts/ failed")
+                return False
+            
+            # Clean up as a run from the repository root would
+            os.chdir(root)
+            results = FileManager(config).cleanup_old_archives()
+            leftover = list((root / "Archive" / "PNGs").rglob("*.png")) if (root / "Archive" / "PNGs").exists() else []
+            
+            if results['png_files_cleaned'] != 1 or leftover:
+                print(f"✗ Expired PNG not cleaned up across working directories: {results}, left: {leftover}")
+                return False
+            
+            print("✓ Expiry log cleanup works across working directories")
+            return True
+            
+    except Exception as e:
+        print(f"✗ Archive expiry log test failed: {e}")
+        return False
+    finally:
+        os.chdir(original_cwd)
+
 def main():
     """Run all basic tests."""
     print("=== BIMailer Basic Functionality Test ===\n")
@@ -130,6 +189,7 @@ def main():
         ("Configuration Files", test_config_files),
         ("Utilities", test_utilities),
         ("Configuration Loading", test_configuration),
+        ("Archive Expiry Log", test_archive_expiry_log),
     ]
     
     passed = 0
@@ -153,7 +213,7 @@ def main():
     if passed == total:
         print("\n🎉 All basic tests passed! The core system is working correctly.")
         print("\nNote: PDF generation and email sending require additional packages:")
-        print("  pip install Pillow reportlab pandas")
+        print("  pip install Pillow reportlab")
     else:
         print(f"\n⚠️  {total-passed} test(s) failed. Please check the issues above.")
     
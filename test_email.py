@@ -3,62 +3,90 @@ Email configuration test script for BIMailer.
 Tests email settings and sends a test email to verify configuration.
 """
 
+import random
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
 # Add Scripts directory to path
 scripts_dir = Path("Scripts")
-sys.path.insert(0, str(scripts_dir))
+if str(scripts_dir) not in sys.path:
+    sys.path.insert(0, str(scripts_dir))
 
+# email_sender (MIME, mailer backends) is imported where needed, so a bad
+# configuration is reported without loading it
 from config_manager import ConfigManager
-from email_sender import EmailSender
-from utils import BIMailerLogger
 
-def test_email_configuration():
-    """Test email configuration and send a test email."""
+# Connection retries for the SMTP test: random exponential backoff between
+# attempts (at most CONNECT_BACKOFF_CAP seconds each), within CONNECT_DEADLINE overall
+CONNECT_ATTEMPTS = 4
+CONNECT_BACKOFF_BASE = 1.0
+CONNECT_BACKOFF_CAP = 8.0
+CONNECT_DEADLINE = 30.0
+
+# Socket timeouts (seconds) while connecting and once connected (login, DATA)
+CONNECT_TIMEOUT = 30
+DATA_TIMEOUT = 60
+
+def test_email_configuration(config=None, server=None):
+    """Test email configuration and send a test email.
+    
+    config is the already loaded ConfigManager (loaded here if omitted); server
+    is an already logged-in SMTP connection (from test_smtp_connection) to send
+    on instead of opening a new one.
+    """
     try:
         print("=== BIMailer Email Configuration Test ===\n")
         
         # Load configuration
-        print("Loading configuration...")
-        config = ConfigManager()
+        if config is None:
+            print("Loading configuration...")
+            config = ConfigManager()
         
-        # Display email configuration
+        # Display email and admin configuration, collected and written in one go
         email_config = config.email_config
-        print(f"Email Configuration:")
-        print(f"  Use Default Mailer: {email_config.use_default_mailer}")
-        print(f"  SMTP Server: {email_config.smtp_server}")
-        print(f"  SMTP Port: {email_config.smtp_port}")
-        print(f"  SMTP Username: {email_config.smtp_username}")
-        print(f"  SMTP Password: {'*' * len(email_config.smtp_password) if email_config.smtp_password else 'Not set'}")
-        print(f"  Use TLS: {email_config.use_tls}")
-        print()
-        
-        # Display admin configuration
         admin_config = config.admin_config
-        print(f"Admin Configuration:")
-        print(f"  Admin Emails: {admin_config.admin_emails}")
-        print(f"  Send Summary Email: {admin_config.send_summary_email}")
-        print(f"  Send Error Notifications: {admin_config.send_error_notifications}")
-        print()
+        config_lines = [
+            "Email Configuration:",
+            f"  Use Default Mailer: {email_config.use_default_mailer}",
+            f"  SMTP Server: {email_config.smtp_server}",
+            f"  SMTP Port: {email_config.smtp_port}",
+            f"  SMTP Username: {email_config.smtp_username}",
+            f"  SMTP Password: {'*' * len(email_config.smtp_password) if email_config.smtp_password else 'Not set'}",
+            f"  Use TLS: {email_config.use_tls}",
+            "",
+            "Admin Configuration:",
+            f"  Admin Emails: {admin_config.admin_emails}",
+            f"  Send Summary Email: {admin_config.send_summary_email}",
+            f"  Send Error Notifications: {admin_config.send_error_notifications}",
+            "",
+        ]
+        sys.stdout.write("\n".join(config_lines) + "\n")
+        
+        # The default mailer only hands a draft to the desktop client; nothing can be verified live
+        if email_config.use_default_mailer:
+            print("Default mailer configured - skipping live send.")
+            return True
         
         # Check if we have valid email configuration
-        if not email_config.use_default_mailer:
-            missing_config = []
-            if not email_config.smtp_server:
-                missing_config.append("SMTP Server")
-            if not email_config.smtp_username:
-                missing_config.append("SMTP Username")
-            if not email_config.smtp_password:
-                missing_config.append("SMTP Password")
-            
-            if missing_config:
-                print(f"❌ Missing SMTP configuration: {', '.join(missing_config)}")
-                print("Please update Config/settings.ini with your email settings.")
-                return False
+        missing_config = []
+        if not email_config.smtp_server:
+            missing_config.append("SMTP Server")
+        if not email_config.smtp_username:
+            missing_config.append("SMTP Username")
+        if not email_config.smtp_password:
+            missing_config.append("SMTP Password")
+        
+        if missing_config:
+            print(f"❌ Missing SMTP configuration: {', '.join(missing_config)}")
+            print("Please update Config/settings.ini with your email settings.")
+            return False
         
         # Initialize email sender
         print("Initializing email sender...")
+        from email_sender import EmailSender, new_message_id
         email_sender = EmailSender(config)
         
         # Test admin notification (this is simpler than PDF email)
@@ -84,7 +112,11 @@ BIMailer Test System
         print(f"Sending test email to: {admin_config.admin_emails}")
         print("This may take a moment...")
         
-        success = email_sender.send_admin_notification(test_subject, test_body, is_error=False)
+        # Transient failures before DATA are retried inside the sender, under this one Message-ID
+        with email_sender.open_session(server):
+            success = email_sender.send_admin_notification(
+                test_subject, test_body, is_error=False, message_id=new_message_id()
+            )
         
         if success:
             print("✅ Test email sent successfully!")
@@ -101,91 +133,208 @@ BIMailer Test System
         traceback.print_exc()
         return False
 
-def test_smtp_connection():
-    """Test SMTP connection without sending email."""
+def _open_connection(email_config, report=print):
+    """Connect to the SMTP server and start TLS if configured (no login).
+    
+    Timeouts are set per socket; the process-wide socket default is left alone.
+    Progress lines go to report.
+    """
+    from email_sender import PipeliningSMTP, PipeliningSMTP_SSL
+    
+    # Check if we should use SSL (port 465) or regular SMTP with TLS (port 587)
+    use_ssl = getattr(email_config, 'use_ssl', False)
+    
+    if use_ssl and email_config.smtp_port == 465:
+        report("Using SSL connection (SMTP_SSL)...")
+        server = PipeliningSMTP_SSL(email_config.smtp_server, email_config.smtp_port, timeout=CONNECT_TIMEOUT)
+        server.sock.settimeout(DATA_TIMEOUT)
+        return server
+    
+    report("Using regular SMTP connection...")
+    server = PipeliningSMTP(email_config.smtp_server, email_config.smtp_port, timeout=CONNECT_TIMEOUT)
+    server.sock.settimeout(DATA_TIMEOUT)
+    if email_config.use_tls:
+        report("Starting TLS...")
+        try:
+            server.starttls()
+        except Exception:
+            server.close()
+            raise
+    return server
+
+
+def _is_transient_connect_error(exc):
+    """Network-level failures worth another attempt; SMTP protocol errors are not."""
+    import smtplib
+    
+    if isinstance(exc, (smtplib.SMTPConnectError, smtplib.SMTPServerDisconnected)):
+        return True
+    # SMTPException subclasses OSError, so rule it out before the network errors
+    return isinstance(exc, OSError) and not isinstance(exc, smtplib.SMTPException)
+
+
+def _connect_with_backoff(email_config, attempts=CONNECT_ATTEMPTS, base=CONNECT_BACKOFF_BASE,
+                          cap=CONNECT_BACKOFF_CAP, deadline=CONNECT_DEADLINE, report=print):
+    """Open the SMTP connection, retrying transient network errors with random exponential backoff.
+    
+    Login is left to the caller and never retried, so a wrong password cannot
+    trigger repeated authentication attempts (and account lockouts).
+    """
+    start = time.monotonic()
+    for attempt in range(attempts):
+        try:
+            return _open_connection(email_config, report)
+        except Exception as e:
+            delay = random.uniform(0, min(cap, base * 2 ** attempt))
+            if (attempt == attempts - 1 or not _is_transient_connect_error(e)
+                    or time.monotonic() - start + delay >= deadline):
+                raise
+            report(f"Connection attempt {attempt + 1} failed ({e}); retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+
+def _start_connecting(email_config, executor):
+    """Begin connecting in the background; returns (future, progress lines) for test_smtp_connection."""
+    notes = []
+    return executor.submit(_connect_with_backoff, email_config, report=notes.append), notes
+
+
+def _discard_connection(future):
+    """Done-callback quitting a background connection nobody is going to use."""
+    if not future.cancelled() and future.exception() is None:
+        _quit_quietly(future.result())
+
+
+def _describe_smtp_failure(exc):
+    """Status line for a failed SMTP connection test (first matching exception type wins)."""
+    import smtplib
+    import socket
+    
+    failures = (
+        (socket.timeout, "Connection timed out. Check server address and port."),
+        (smtplib.SMTPAuthenticationError, "Authentication failed: {e}"),
+        (smtplib.SMTPConnectError, "Connection failed: {e}"),
+    )
+    for exc_type, message in failures:
+        if isinstance(exc, exc_type):
+            return message.format(e=exc)
+    return f"Unexpected error: {exc}"
+
+
+def _quit_quietly(server):
+    """Best-effort QUIT; the connection may already be closed or broken."""
+    if server is None:
+        return
+    try:
+        server.quit()
+    except Exception:
+        pass
+
+
+def test_smtp_connection(config=None, connecting=None):
+    """Test SMTP connection without sending email.
+    
+    connecting is an already started background connect from _start_connecting.
+    Returns (success, server); on success server is the logged-in connection
+    (None for the default mailer), left open so the email test can reuse it.
+    """
     try:
         print("\n=== SMTP Connection Test ===")
         
-        config = ConfigManager()
+        if config is None:
+            config = ConfigManager()
         email_config = config.email_config
         
         if email_config.use_default_mailer:
             print("Using default mailer (mailto) - no SMTP connection to test.")
-            return True
+            return True, None
         
         print(f"Testing connection to {email_config.smtp_server}:{email_config.smtp_port}")
         print(f"SSL: {getattr(email_config, 'use_ssl', False)}, TLS: {email_config.use_tls}")
         
         import smtplib
-        import socket
-        
-        # Set connection timeout
-        socket.setdefaulttimeout(30)
         
         server = None
         try:
-            # Check if we should use SSL (port 465) or regular SMTP with TLS (port 587)
-            use_ssl = getattr(email_config, 'use_ssl', False)
-            
-            if use_ssl and email_config.smtp_port == 465:
-                print("Using SSL connection (SMTP_SSL)...")
-                server = smtplib.SMTP_SSL(email_config.smtp_server, email_config.smtp_port, timeout=30)
+            if connecting is not None:
+                future, notes = connecting
+                try:
+                    server = future.result()
+                finally:
+                    # Replay the background thread's progress in order
+                    for note in notes:
+                        print(note)
             else:
-                print("Using regular SMTP connection...")
-                server = smtplib.SMTP(email_config.smtp_server, email_config.smtp_port, timeout=30)
-                
-                if email_config.use_tls:
-                    print("Starting TLS...")
-                    server.starttls()
+                server = _connect_with_backoff(email_config)
             
             print("Connection established. Attempting login...")
             server.login(email_config.smtp_username, email_config.smtp_password)
             
+            # A NOOP on the logged-in session confirms it is ready for the test email
+            code, message = server.noop()
+            if code != 250:
+                raise smtplib.SMTPResponseException(code, message)
+            
             print("✅ SMTP connection and authentication successful!")
-            server.quit()
-            return True
+            return True, server
             
-        except socket.timeout:
-            print("❌ Connection timed out. Check server address and port.")
-            if server:
-                server.quit()
-            return False
-        except smtplib.SMTPAuthenticationError as e:
-            print(f"❌ Authentication failed: {e}")
-            if server:
-                server.quit()
-            return False
-        except smtplib.SMTPConnectError as e:
-            print(f"❌ Connection failed: {e}")
-            return False
         except Exception as e:
-            print(f"❌ Unexpected error: {e}")
-            if server:
-                server.quit()
-            return False
+            print(f"❌ {_describe_smtp_failure(e)}")
+            _quit_quietly(server)
+            return False, None
         
     except Exception as e:
         print(f"❌ SMTP connection test failed: {e}")
-        return False
+        return False, None
+
+@contextmanager
+def _open_smtp(config, connecting=None):
+    """Run the SMTP connection test and yield (success, server), quitting the server on exit."""
+    smtp_success, server = test_smtp_connection(config, connecting)
+    if server is None and connecting is not None:
+        # The test bailed out early; don't leave a background connection open
+        connecting[0].add_done_callback(_discard_connection)
+    try:
+        yield smtp_success, server
+    finally:
+        # Quit now rather than leaving it in the sender's kept pool until exit
+        _quit_quietly(server)
+
 
 def main():
     """Main test function."""
     print("BIMailer Email Configuration Test\n")
     
-    # Test SMTP connection first
-    smtp_success = test_smtp_connection()
-    
-    if not smtp_success:
-        print("\n⚠️  SMTP connection failed. Check your email settings in Config/settings.ini")
-        print("\nCommon issues:")
-        print("- Incorrect server address or port")
-        print("- Wrong username or password")
-        print("- Firewall blocking connection")
-        print("- Server requires app-specific password (Gmail, Outlook)")
-        return 1
-    
-    # Test full email sending
-    email_success = test_email_configuration()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Parse the settings once for both tests
+        try:
+            print("Loading configuration...")
+            config = ConfigManager()
+            # Settings are parsed on first access; touch them here so a missing or
+            # invalid settings file is reported instead of raising a traceback later
+            email_config = config.email_config
+            
+            # Start the DNS/TCP/TLS handshake now so it overlaps with the test's own setup and output
+            connecting = None
+            if not email_config.use_default_mailer:
+                connecting = _start_connecting(email_config, executor)
+        except Exception as e:
+            print(f"❌ Failed to load configuration: {e}")
+            return 1
+        
+        # Test SMTP connection first; the email test then sends on the same connection
+        with _open_smtp(config, connecting) as (smtp_success, server):
+            if not smtp_success:
+                print("\n⚠️  SMTP connection failed. Check your email settings in Config/settings.ini")
+                print("\nCommon issues:")
+                print("- Incorrect server address or port")
+                print("- Wrong username or password")
+                print("- Firewall blocking connection")
+                print("- Server requires app-specific password (Gmail, Outlook)")
+                return 1
+            
+            # Test full email sending
+            email_success = test_email_configuration(config, server=server)
     
     if email_success:
         print("\n🎉 Email configuration test completed successfully!")